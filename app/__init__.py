@@ -1,15 +1,25 @@
 from flask import Flask
 
+from app.admission import init_app as init_admission
 from app.config import Config
 from app.db import init_app as init_db
+from app.metrics import init_app as init_metrics
+from app.routes.api import api_bp
 from app.routes.web import web_bp
+from app.services.fit_cache import init_app as init_fit_cache
+from app.services.single_flight import init_app as init_single_flight
 
 
 def create_app() -> Flask:
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    init_metrics(app)
     init_db(app)
+    init_fit_cache(app)
+    init_single_flight(app)
+    init_admission(app)
 
     app.register_blueprint(web_bp)
+    app.register_blueprint(api_bp)
     return app
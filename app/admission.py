@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from threading import Condition
+from typing import Iterator
+
+
+class Overloaded(Exception):
+    """No valuation slot became free before the queue deadline."""
+
+
+class AdmissionController:
+    """Bound the number of concurrent valuations and shed the excess quickly.
+
+    At most ``limit`` requests run at once. Others wait up to
+    ``queue_timeout`` seconds for a slot; requests arriving when ``max_queue``
+    are already waiting, or whose wait runs out, get ``Overloaded`` instead of
+    piling up on the connection pool.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        queue_timeout: float,
+        max_queue: int,
+        metrics=None,
+    ):
+        self.limit = limit
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.metrics = metrics
+        self._cond = Condition()
+        self._active = 0
+        self._waiting = 0
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        if self.limit <= 0:
+            yield
+            return
+
+        deadline = time.monotonic() + self.queue_timeout
+        with self._cond:
+            if self._active >= self.limit:
+                if self._waiting >= self.max_queue:
+                    self._shed()
+                self._waiting += 1
+                self._publish()
+                try:
+                    while self._active >= self.limit:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._shed()
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+                    self._publish()
+            self._active += 1
+            self._publish()
+        self._incr("admission_admitted")
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._publish()
+                self._cond.notify()
+
+    def _shed(self) -> None:
+        self._incr("admission_shed")
+        raise Overloaded()
+
+    def _publish(self) -> None:
+        if self.metrics is not None:
+            self.metrics.set_gauge("admission_in_flight", self._active)
+            self.metrics.set_gauge("admission_queue_depth", self._waiting)
+
+    def _incr(self, name: str) -> None:
+        if self.metrics is not None:
+            self.metrics.incr(name)
+
+
+def init_app(app) -> None:
+    app.extensions["admission"] = AdmissionController(
+        limit=app.config["ADMISSION_LIMIT"],
+        queue_timeout=app.config["ADMISSION_QUEUE_TIMEOUT"],
+        max_queue=app.config["ADMISSION_MAX_QUEUE"],
+        metrics=app.extensions["metrics"],
+    )
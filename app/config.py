@@ -12,3 +12,23 @@ class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY", "dev-secret")
     OUTLIER_TRIM_PCT = float(os.environ.get("OUTLIER_TRIM_PCT", "0.05"))
     DEPRECIATION_PER_10K = int(os.environ.get("DEPRECIATION_PER_10K", "300"))
+    PREPARE_THRESHOLD = int(os.environ.get("PREPARE_THRESHOLD", "1"))
+    FIT_CACHE_SIZE = int(os.environ.get("FIT_CACHE_SIZE", "1024"))
+    # Comparable rows held across all cached fits, about 330 bytes each as
+    # measured by benchmarks/bench_results_page.py.
+    FIT_CACHE_MAX_ROWS = int(os.environ.get("FIT_CACHE_MAX_ROWS", "250000"))
+    # Seconds a coalesced request waits on another's fit before running its own.
+    SINGLE_FLIGHT_WAIT_TIMEOUT = float(os.environ.get("SINGLE_FLIGHT_WAIT_TIMEOUT", "1"))
+    DATA_VERSION_TTL = float(os.environ.get("DATA_VERSION_TTL", "5"))
+    API_COMPRESS_MIN_BYTES = int(os.environ.get("API_COMPRESS_MIN_BYTES", "512"))
+    # 0 fits every comparable; otherwise fit a stratified sample of about this many.
+    VALUATION_SAMPLE_CAP = int(os.environ.get("VALUATION_SAMPLE_CAP", "0"))
+    VALUATION_SAMPLE_BUCKET_MILES = int(
+        os.environ.get("VALUATION_SAMPLE_BUCKET_MILES", "10000"))
+    # Concurrent valuations per worker; 0 disables admission control.
+    ADMISSION_LIMIT = int(os.environ.get("ADMISSION_LIMIT", "10"))
+    ADMISSION_QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", "0.5"))
+    ADMISSION_MAX_QUEUE = int(os.environ.get("ADMISSION_MAX_QUEUE", "50"))
+    ADMISSION_RETRY_AFTER = int(os.environ.get("ADMISSION_RETRY_AFTER", "2"))
+    # Serve estimates from cached fits instead of 503 when shedding.
+    ADMISSION_DEGRADED = os.environ.get("ADMISSION_DEGRADED", "1") == "1"
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from typing import Generator
+from threading import Lock
+from typing import Generator, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 
@@ -13,19 +15,60 @@ class Base(DeclarativeBase):
 
 SessionLocal = sessionmaker(class_=Session, autoflush=False, autocommit=False)
 
+_engine_lock = Lock()
 
-def get_engine(database_url: str):
-    return create_engine(database_url, future=True)
+
+def get_engine(database_url: str, prepare_threshold: Optional[int] = None):
+    connect_args = {}
+    if prepare_threshold is not None and database_url.startswith("postgresql+psycopg"):
+        # psycopg turns a statement into a server-side prepared statement once it
+        # has been executed this many times on a connection, so Postgres stops
+        # re-planning it.
+        connect_args["prepare_threshold"] = prepare_threshold
+    return create_engine(database_url, future=True, connect_args=connect_args)
+
+
+def instrument_engine(engine, metrics) -> None:
+    """Record SQLAlchemy compiled-statement cache hits and misses.
+
+    These count every statement the engine runs, and only say whether the SQL
+    string was rebuilt. Server-side plan reuse comes from psycopg's
+    ``prepare_threshold`` and is not visible here.
+    """
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_cache_stats(conn, cursor, statement, parameters, context, executemany):
+        if context is None:
+            return
+        if context.cache_hit is CACHE_HIT:
+            metrics.incr("compiled_cache_hits")
+        elif context.cache_hit is CACHE_MISS:
+            metrics.incr("compiled_cache_misses")
 
 
 def init_app(app) -> None:
-    engine = get_engine(app.config["DATABASE_URL"])
-    app.extensions["engine"] = engine
+    # The engine (and with it the DB driver import) is created on first use.
+    app.extensions["engine"] = None
+
+
+def app_engine(app):
+    engine = app.extensions.get("engine")
+    if engine is None:
+        with _engine_lock:
+            engine = app.extensions.get("engine")
+            if engine is None:
+                engine = get_engine(
+                    app.config["DATABASE_URL"],
+                    prepare_threshold=app.config.get("PREPARE_THRESHOLD"),
+                )
+                instrument_engine(engine, app.extensions["metrics"])
+                app.extensions["engine"] = engine
+    return engine
 
 
 @contextmanager
 def get_session(app) -> Generator[Session, None, None]:
-    engine = app.extensions["engine"]
+    engine = app_engine(app)
     session = SessionLocal(bind=engine)
     try:
         yield session
@@ -0,0 +1,212 @@
+"""Load and swap a single model-year partition of ``listings``.
+
+The year's rows are built from ``market_listings_raw`` into a standalone
+table, indexed and constrained to match the partitioned parent, and only then
+swapped in. The bulk load and index builds hold no locks on ``listings`` or its
+other partitions. The swap does: DETACH takes an ACCESS EXCLUSIVE lock on the
+``listings`` parent, so reads of every year wait for the swap transaction (and
+for at most ``SWAP_LOCK_TIMEOUT`` while it queues for the lock). CHECK
+constraints validated beforehand keep ATTACH from scanning under that lock, so
+the transaction is metadata-only. ``DETACH ... CONCURRENTLY`` would avoid the
+lock but is not allowed while ``listings`` has a default partition. The swap
+also bumps ``data_version`` so cached fits for the year are dropped.
+
+    python -m app.ingestion.partitions 2018 2019
+"""
+from __future__ import annotations
+
+import sys
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.config import Config
+from app.db import get_engine
+from app.ingestion.reload import bump_data_version
+
+# Must mirror the indexes on the parent (0003_partition_listings) so ATTACH
+# adopts them instead of building new ones under lock.
+PARTITION_INDEXES = {
+    "vin": ["vin"],
+    "price": ["price"],
+    "mileage": ["mileage"],
+    "listing_status": ["listing_status"],
+    "last_seen_date": ["last_seen_date"],
+}
+
+SWAP_LOCK_TIMEOUT = "5s"
+
+_LOAD_SQL = """
+INSERT INTO {table} (
+    year,
+    vin,
+    dealer_id,
+    price,
+    mileage,
+    used,
+    certified,
+    first_seen_date,
+    last_seen_date,
+    listing_status
+)
+SELECT
+    v.year,
+    v.vin,
+    d.id AS dealer_id,
+    r.listing_price,
+    r.listing_mileage,
+    r.used,
+    r.certified,
+    r.first_seen_date,
+    r.last_seen_date,
+    NULLIF(TRIM(r.listing_status), '') AS listing_status
+FROM market_listings_raw r
+-- Partition by the decoded vehicle year, as the full reload does; the raw
+-- feed's own year column disagrees with it for some VINs, so it cannot narrow
+-- the scan and each load reads market_listings_raw once in full.
+JOIN vehicles v ON v.vin = UPPER(TRIM(r.vin))
+LEFT JOIN dealers d ON
+    d.name = NULLIF(TRIM(r.dealer_name), '')
+    AND d.street IS NOT DISTINCT FROM NULLIF(TRIM(r.dealer_street), '')
+    AND d.city IS NOT DISTINCT FROM NULLIF(TRIM(r.dealer_city), '')
+    AND d.state IS NOT DISTINCT FROM NULLIF(TRIM(r.dealer_state), '')
+    AND d.zip IS NOT DISTINCT FROM NULLIF(TRIM(r.dealer_zip), '')
+    AND d.website IS NOT DISTINCT FROM NULLIF(TRIM(r.seller_website), '')
+WHERE v.year = :year
+"""
+
+
+def partition_name(year: int) -> str:
+    return f"listings_y{int(year)}"
+
+
+def load_year_partition(engine: Engine, year: int) -> int:
+    """Rebuild the ``listings`` partition for ``year`` and swap it in.
+
+    Expects ``vehicles`` and ``dealers`` to already hold the year's rows.
+    Returns the number of listings loaded.
+    """
+    year = int(year)
+    partition = partition_name(year)
+    staging = f"{partition}_load"
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+        # Defaults come along, so ids are still drawn from listings_id_seq.
+        conn.execute(
+            text(f"CREATE TABLE {staging} (LIKE listings INCLUDING DEFAULTS)")
+        )
+        loaded = conn.execute(text(_LOAD_SQL.format(table=staging)), {"year": year}).rowcount
+
+        # A CHECK matching the partition bound lets ATTACH skip its validation
+        # scan; the key, foreign keys and indexes are adopted by the parent's.
+        conn.execute(
+            text(
+                f"ALTER TABLE {staging} ADD CONSTRAINT {staging}_year_check "
+                f"CHECK (year IS NOT NULL AND year = {year})"
+            )
+        )
+        conn.execute(
+            text(
+                f"ALTER TABLE {staging} ADD CONSTRAINT {staging}_pkey "
+                f"PRIMARY KEY (year, id)"
+            )
+        )
+        conn.execute(
+            text(
+                f"ALTER TABLE {staging} ADD FOREIGN KEY (vin) REFERENCES vehicles (vin)"
+            )
+        )
+        conn.execute(
+            text(
+                f"ALTER TABLE {staging} ADD FOREIGN KEY (dealer_id) REFERENCES dealers (id)"
+            )
+        )
+        for suffix, columns in PARTITION_INDEXES.items():
+            conn.execute(
+                text(
+                    f"CREATE INDEX {staging}_{suffix}_idx "
+                    f"ON {staging} ({', '.join(columns)})"
+                )
+            )
+        conn.execute(text(f"ANALYZE {staging}"))
+
+    # ATTACH must also prove listings_default has no rows of the year, which
+    # is a full scan under the swap's locks unless a valid CHECK already says
+    # so. VALIDATE CONSTRAINT only takes SHARE UPDATE EXCLUSIVE, so reads and
+    # writes carry on while it scans.
+    default_check = f"listings_default_not_y{year}"
+    with engine.begin() as conn:
+        conn.execute(text(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'"))
+        conn.execute(
+            text(f"ALTER TABLE listings_default DROP CONSTRAINT IF EXISTS {default_check}")
+        )
+        default_rows = conn.execute(
+            text("SELECT EXISTS (SELECT 1 FROM listings_default WHERE year = :year)"),
+            {"year": year},
+        ).scalar_one()
+        if not default_rows:
+            conn.execute(
+                text(
+                    f"ALTER TABLE listings_default ADD CONSTRAINT {default_check} "
+                    f"CHECK (year <> {year}) NOT VALID"
+                )
+            )
+    if not default_rows:
+        with engine.begin() as conn:
+            conn.execute(
+                text(f"ALTER TABLE listings_default VALIDATE CONSTRAINT {default_check}")
+            )
+
+    with engine.begin() as conn:
+        # Give up rather than queue behind long-running queries: a waiting
+        # ACCESS EXCLUSIVE request would block every new reader of listings.
+        conn.execute(text(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'"))
+        exists = conn.execute(
+            text("SELECT to_regclass(:name) IS NOT NULL"), {"name": partition}
+        ).scalar_one()
+        if exists:
+            conn.execute(text(f"ALTER TABLE listings DETACH PARTITION {partition}"))
+        if default_rows:
+            # The year had no partition, so its rows went to the default one
+            # and ATTACH refuses to run while they are there. The staging table
+            # holds the year's full reload, so they are superseded. ATTACH then
+            # scans listings_default under lock; this happens once per year.
+            conn.execute(
+                text("DELETE FROM listings_default WHERE year = :year"), {"year": year}
+            )
+        conn.execute(
+            text(
+                f"ALTER TABLE listings ATTACH PARTITION {staging} "
+                f"FOR VALUES IN ({year})"
+            )
+        )
+        if exists:
+            conn.execute(text(f"DROP TABLE {partition}"))
+        conn.execute(text(f"ALTER TABLE {staging} RENAME TO {partition}"))
+        conn.execute(
+            text(f"ALTER TABLE {partition} DROP CONSTRAINT {staging}_year_check")
+        )
+        conn.execute(
+            text(f"ALTER TABLE listings_default DROP CONSTRAINT IF EXISTS {default_check}")
+        )
+        # Take over the names the old partition's key and indexes had, so the
+        # next load of this year can create its staging ones again.
+        for suffix in ["pkey"] + [f"{name}_idx" for name in PARTITION_INDEXES]:
+            conn.execute(
+                text(f"ALTER INDEX {staging}_{suffix} RENAME TO {partition}_{suffix}")
+            )
+        bump_data_version(conn)
+
+    return loaded
+
+
+def main(argv: list[str]) -> None:
+    engine = get_engine(Config.DATABASE_URL)
+    for year in argv:
+        loaded = load_year_partition(engine, int(year))
+        print(f"{partition_name(int(year))}: {loaded} listings")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
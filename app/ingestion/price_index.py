@@ -0,0 +1,109 @@
+"""Build the monthly price index rollup from listing date ranges.
+
+One ``INSERT ... SELECT`` adds each listing's mileage and price to every month
+between its first and last seen date, per (year, make, model), expanding the
+months with ``generate_series`` and aggregating in Postgres.
+Passing a start month rebuilds only that month and later ones, reading only
+listings still seen by then, so new months can be appended cheaply.
+
+    python -m app.ingestion.price_index            # full rebuild
+    python -m app.ingestion.price_index 2026-09    # September 2026 onwards
+    python -m app.ingestion.price_index --append   # latest rolled-up month onwards
+"""
+from __future__ import annotations
+
+import sys
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import Config
+from app.db import SessionLocal, get_engine
+from app.repositories.price_index_repo import PriceIndexRepository
+
+_BUILD_SQL = """
+INSERT INTO price_index_monthly (
+    year,
+    make,
+    model,
+    month,
+    listings,
+    sum_mileage,
+    sum_price,
+    sum_mileage_sq,
+    sum_mileage_price
+)
+SELECT
+    v.year,
+    v.make,
+    v.model,
+    m.month::date,
+    COUNT(*),
+    SUM(l.mileage::float8),
+    SUM(l.price::float8),
+    SUM(l.mileage::float8 * l.mileage::float8),
+    SUM(l.mileage::float8 * l.price::float8)
+FROM listings l
+JOIN vehicles v ON v.vin = l.vin
+CROSS JOIN LATERAL generate_series(
+    -- GREATEST ignores a NULL start month, i.e. a full rebuild.
+    date_trunc(
+        'month',
+        GREATEST(
+            COALESCE(l.first_seen_date, l.last_seen_date),
+            CAST(:start_month AS date)
+        )::timestamp
+    ),
+    COALESCE(l.last_seen_date, l.first_seen_date)::timestamp,
+    interval '1 month'
+) AS m(month)
+WHERE COALESCE(l.first_seen_date, l.last_seen_date) IS NOT NULL
+    AND l.price IS NOT NULL
+    AND l.mileage IS NOT NULL
+    {start_filter}
+GROUP BY v.year, v.make, v.model, m.month
+"""
+
+# Spelled out rather than on the coalesce so both arms can use
+# ix_listings_last_seen_date (btree indexes serve IS NULL too).
+_START_FILTER = """
+    AND (
+        l.last_seen_date >= :start_month
+        OR (l.last_seen_date IS NULL AND l.first_seen_date >= :start_month)
+    )
+"""
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def build_price_index(session: Session, start_month: Optional[date] = None) -> int:
+    """Rebuild the rollup from ``start_month`` on. Returns the number of rows written."""
+    if start_month is not None:
+        start_month = month_start(start_month)
+
+    PriceIndexRepository(session).delete_from(start_month)
+    sql = _BUILD_SQL.format(start_filter=_START_FILTER if start_month is not None else "")
+    return session.execute(text(sql), {"start_month": start_month}).rowcount
+
+
+def main(argv: list[str]) -> None:
+    engine = get_engine(Config.DATABASE_URL)
+    with SessionLocal(bind=engine) as session:
+        start_month = None
+        if argv and argv[0] == "--append":
+            # The latest month may have been partial when it was rolled up.
+            start_month = PriceIndexRepository(session).latest_month()
+        elif argv:
+            year, month = argv[0].split("-")
+            start_month = date(int(year), int(month), 1)
+        written = build_price_index(session, start_month)
+        session.commit()
+    print(f"price_index_monthly: {written} rows")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,367 @@
+"""Blue/green reload of the market data.
+
+``vehicles``, ``dealers`` and ``listings`` are rebuilt from
+``market_listings_raw`` into a shadow schema while the live tables keep
+serving valuations. Secondary indexes are built in parallel, row counts are
+validated, and the shadow tables are then moved into ``public`` in a single
+transaction that also bumps ``data_version`` so every worker's fit cache is
+invalidated.
+
+    python -m app.ingestion.reload
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.config import Config
+from app.db import get_engine
+
+SHADOW_SCHEMA = "carvalue_shadow"
+RETIRED_SCHEMA = "carvalue_retired"
+LIVE_SCHEMA = "public"
+
+SWAP_LOCK_TIMEOUT = "5s"
+
+# Refuse to swap in a load that is much smaller than what is live.
+MIN_LIVE_RATIO = 0.5
+
+SHADOW_INDEXES = [
+    "CREATE INDEX ix_vehicles_year_make_model ON {schema}.vehicles (year, make, model)",
+    "CREATE INDEX ix_vehicles_squish_vin ON {schema}.vehicles "
+    "(squish_vin, year, make, model, trim)",
+    "CREATE INDEX ix_listings_vin ON {schema}.listings (vin)",
+    "CREATE INDEX ix_listings_price ON {schema}.listings (price)",
+    "CREATE INDEX ix_listings_mileage ON {schema}.listings (mileage)",
+    "CREATE INDEX ix_listings_listing_status ON {schema}.listings (listing_status)",
+    "CREATE INDEX ix_listings_last_seen_date ON {schema}.listings (last_seen_date)",
+]
+
+_CREATE_TABLES = [
+    """
+    CREATE TABLE {schema}.vehicles (
+        vin VARCHAR PRIMARY KEY,
+        squish_vin VARCHAR,
+        year INTEGER NOT NULL,
+        make VARCHAR,
+        model VARCHAR,
+        trim VARCHAR,
+        style VARCHAR,
+        driven_wheels VARCHAR,
+        engine VARCHAR,
+        fuel_type VARCHAR,
+        exterior_color VARCHAR,
+        interior_color VARCHAR
+    )
+    """,
+    """
+    CREATE TABLE {schema}.dealers (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR NOT NULL,
+        street VARCHAR,
+        city VARCHAR,
+        state VARCHAR,
+        zip VARCHAR,
+        website VARCHAR
+    )
+    """,
+    """
+    CREATE TABLE {schema}.listings (
+        id BIGSERIAL NOT NULL,
+        year INTEGER NOT NULL,
+        vin VARCHAR NOT NULL,
+        dealer_id INTEGER,
+        price NUMERIC,
+        mileage INTEGER,
+        used BOOLEAN,
+        certified BOOLEAN,
+        first_seen_date DATE,
+        last_seen_date DATE,
+        listing_status VARCHAR,
+        PRIMARY KEY (year, id)
+    ) PARTITION BY LIST (year)
+    """,
+]
+
+_LOAD_VEHICLES = """
+INSERT INTO {schema}.vehicles (
+    vin,
+    squish_vin,
+    year,
+    make,
+    model,
+    trim,
+    style,
+    driven_wheels,
+    engine,
+    fuel_type,
+    exterior_color,
+    interior_color
+)
+SELECT DISTINCT ON (UPPER(TRIM(vin)))
+    UPPER(TRIM(vin)) AS vin,
+    SUBSTR(UPPER(TRIM(vin)), 1, 8) || SUBSTR(UPPER(TRIM(vin)), 10, 1) AS squish_vin,
+    year,
+    UPPER(TRIM(make)) AS make,
+    UPPER(TRIM(model)) AS model,
+    NULLIF(TRIM(trim), '') AS trim,
+    NULLIF(TRIM(style), '') AS style,
+    NULLIF(TRIM(driven_wheels), '') AS driven_wheels,
+    NULLIF(TRIM(engine), '') AS engine,
+    NULLIF(TRIM(fuel_type), '') AS fuel_type,
+    NULLIF(TRIM(exterior_color), '') AS exterior_color,
+    NULLIF(TRIM(interior_color), '') AS interior_color
+FROM market_listings_raw
+WHERE vin IS NOT NULL AND TRIM(vin) <> ''
+"""
+
+_LOAD_DEALERS = """
+INSERT INTO {schema}.dealers (name, street, city, state, zip, website)
+SELECT DISTINCT
+    NULLIF(TRIM(dealer_name), '') AS name,
+    NULLIF(TRIM(dealer_street), '') AS street,
+    NULLIF(TRIM(dealer_city), '') AS city,
+    NULLIF(TRIM(dealer_state), '') AS state,
+    NULLIF(TRIM(dealer_zip), '') AS zip,
+    NULLIF(TRIM(seller_website), '') AS website
+FROM market_listings_raw
+WHERE dealer_name IS NOT NULL AND TRIM(dealer_name) <> ''
+"""
+
+_LOAD_LISTINGS = """
+INSERT INTO {schema}.listings (
+    year,
+    vin,
+    dealer_id,
+    price,
+    mileage,
+    used,
+    certified,
+    first_seen_date,
+    last_seen_date,
+    listing_status
+)
+SELECT
+    v.year,
+    v.vin,
+    d.id AS dealer_id,
+    r.listing_price,
+    r.listing_mileage,
+    r.used,
+    r.certified,
+    r.first_seen_date,
+    r.last_seen_date,
+    NULLIF(TRIM(r.listing_status), '') AS listing_status
+FROM market_listings_raw r
+JOIN {schema}.vehicles v ON v.vin = UPPER(TRIM(r.vin))
+LEFT JOIN {schema}.dealers d ON
+    d.name = NULLIF(TRIM(r.dealer_name), '')
+    AND d.street IS NOT DISTINCT FROM NULLIF(TRIM(r.dealer_street), '')
+    AND d.city IS NOT DISTINCT FROM NULLIF(TRIM(r.dealer_city), '')
+    AND d.state IS NOT DISTINCT FROM NULLIF(TRIM(r.dealer_state), '')
+    AND d.zip IS NOT DISTINCT FROM NULLIF(TRIM(r.dealer_zip), '')
+    AND d.website IS NOT DISTINCT FROM NULLIF(TRIM(r.seller_website), '')
+WHERE r.vin IS NOT NULL AND TRIM(r.vin) <> ''
+"""
+
+_EXPECTED_COUNTS = {
+    "vehicles": """
+        SELECT COUNT(DISTINCT UPPER(TRIM(vin))) FROM market_listings_raw
+        WHERE vin IS NOT NULL AND TRIM(vin) <> ''
+    """,
+    "listings": """
+        SELECT COUNT(*) FROM market_listings_raw
+        WHERE vin IS NOT NULL AND TRIM(vin) <> ''
+    """,
+}
+
+
+class ReloadValidationError(RuntimeError):
+    """The shadow tables do not look like a complete load."""
+
+
+@dataclass
+class ReloadResult:
+    vehicles: int
+    dealers: int
+    listings: int
+    data_version: int
+
+
+def _count(conn: Connection, schema: str, table: str) -> int:
+    return conn.execute(text(f"SELECT COUNT(*) FROM {schema}.{table}")).scalar_one()
+
+
+def _listing_partitions(conn: Connection, schema: str) -> list[str]:
+    return list(
+        conn.execute(
+            text(
+                """
+                SELECT c.relname
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                JOIN pg_class p ON p.oid = i.inhparent
+                JOIN pg_namespace n ON n.oid = p.relnamespace
+                WHERE n.nspname = :schema AND p.relname = 'listings'
+                """
+            ),
+            {"schema": schema},
+        ).scalars()
+    )
+
+
+def build_shadow(engine: Engine) -> None:
+    """Create and load the shadow schema. Does not touch the live tables."""
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SHADOW_SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SHADOW_SCHEMA}"))
+        for ddl in _CREATE_TABLES:
+            conn.execute(text(ddl.format(schema=SHADOW_SCHEMA)))
+
+        years = conn.execute(
+            text(
+                "SELECT DISTINCT year FROM market_listings_raw "
+                "WHERE year IS NOT NULL ORDER BY year"
+            )
+        ).scalars()
+        for year in years:
+            conn.execute(
+                text(
+                    f"CREATE TABLE {SHADOW_SCHEMA}.listings_y{int(year)} "
+                    f"PARTITION OF {SHADOW_SCHEMA}.listings FOR VALUES IN ({int(year)})"
+                )
+            )
+        conn.execute(
+            text(
+                f"CREATE TABLE {SHADOW_SCHEMA}.listings_default "
+                f"PARTITION OF {SHADOW_SCHEMA}.listings DEFAULT"
+            )
+        )
+
+        conn.execute(text(_LOAD_VEHICLES.format(schema=SHADOW_SCHEMA)))
+        conn.execute(text(_LOAD_DEALERS.format(schema=SHADOW_SCHEMA)))
+        conn.execute(text(_LOAD_LISTINGS.format(schema=SHADOW_SCHEMA)))
+
+
+def build_shadow_indexes(engine: Engine, workers: int = 4) -> None:
+    """Build the secondary indexes concurrently, one connection per index.
+
+    CREATE INDEX only takes a SHARE lock, so builds on the same table do not
+    block each other.
+    """
+
+    def build(ddl: str) -> None:
+        with engine.begin() as conn:
+            conn.execute(text(ddl.format(schema=SHADOW_SCHEMA)))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(build, SHADOW_INDEXES))
+
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                f"ALTER TABLE {SHADOW_SCHEMA}.listings ADD FOREIGN KEY (vin) "
+                f"REFERENCES {SHADOW_SCHEMA}.vehicles (vin)"
+            )
+        )
+        conn.execute(
+            text(
+                f"ALTER TABLE {SHADOW_SCHEMA}.listings ADD FOREIGN KEY (dealer_id) "
+                f"REFERENCES {SHADOW_SCHEMA}.dealers (id)"
+            )
+        )
+        for table in ("vehicles", "dealers", "listings"):
+            conn.execute(text(f"ANALYZE {SHADOW_SCHEMA}.{table}"))
+
+
+def validate_shadow(engine: Engine, min_live_ratio: float = MIN_LIVE_RATIO) -> dict[str, int]:
+    with engine.connect() as conn:
+        counts = {
+            table: _count(conn, SHADOW_SCHEMA, table)
+            for table in ("vehicles", "dealers", "listings")
+        }
+        for table, sql in _EXPECTED_COUNTS.items():
+            expected = conn.execute(text(sql)).scalar_one()
+            if counts[table] != expected:
+                raise ReloadValidationError(
+                    f"{table}: loaded {counts[table]} rows, expected {expected}"
+                )
+        for table, loaded in counts.items():
+            live = _count(conn, LIVE_SCHEMA, table)
+            if live and loaded < live * min_live_ratio:
+                raise ReloadValidationError(
+                    f"{table}: loaded {loaded} rows, live table has {live}"
+                )
+    return counts
+
+
+def bump_data_version(conn: Connection) -> int:
+    """Bump ``data_version`` in the caller's transaction, so fit caches drop with the swap."""
+    return conn.execute(
+        text(
+            "UPDATE data_version SET version = version + 1, loaded_at = now() "
+            "WHERE id = 1 RETURNING version"
+        )
+    ).scalar_one()
+
+
+def swap_shadow(engine: Engine) -> int:
+    """Move the shadow tables into ``public`` atomically and bump the data version."""
+    with engine.begin() as conn:
+        conn.execute(text(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'"))
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {RETIRED_SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {RETIRED_SCHEMA}"))
+
+        # Partitions are separate tables and have to be moved one by one.
+        live_tables = _listing_partitions(conn, LIVE_SCHEMA) + [
+            "listings", "dealers", "vehicles"]
+        shadow_tables = _listing_partitions(conn, SHADOW_SCHEMA) + [
+            "listings", "dealers", "vehicles"]
+        for table in live_tables:
+            conn.execute(text(f"ALTER TABLE {LIVE_SCHEMA}.{table} SET SCHEMA {RETIRED_SCHEMA}"))
+        for table in shadow_tables:
+            conn.execute(text(f"ALTER TABLE {SHADOW_SCHEMA}.{table} SET SCHEMA {LIVE_SCHEMA}"))
+
+        version = bump_data_version(conn)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {RETIRED_SCHEMA} CASCADE"))
+        conn.execute(text(f"DROP SCHEMA {SHADOW_SCHEMA} CASCADE"))
+    return version
+
+
+def reload_market_data(
+    engine: Engine,
+    index_workers: int = 4,
+    on_swap: Optional[Callable[[int], None]] = None,
+) -> ReloadResult:
+    """Rebuild the market tables from ``market_listings_raw`` and swap them in.
+
+    Other processes notice the new data version within ``DATA_VERSION_TTL``;
+    ``on_swap`` is called with the new version so the calling process can
+    invalidate its caches immediately.
+    """
+    build_shadow(engine)
+    build_shadow_indexes(engine, workers=index_workers)
+    counts = validate_shadow(engine)
+    version = swap_shadow(engine)
+    if on_swap is not None:
+        on_swap(version)
+    return ReloadResult(data_version=version, **counts)
+
+
+def main() -> None:
+    engine = get_engine(Config.DATABASE_URL)
+    result = reload_market_data(engine)
+    print(
+        f"data version {result.data_version}: {result.vehicles} vehicles, "
+        f"{result.dealers} dealers, {result.listings} listings"
+    )
+
+
+if __name__ == "__main__":
+    main()
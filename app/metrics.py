@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from threading import Lock
+
+
+class Metrics:
+    """Thread-safe in-process counters and gauges."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._counters: dict[str, int] = defaultdict(int)
+        self._gauges: dict[str, float] = {}
+
+    def incr(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def get(self, name: str) -> float:
+        with self._lock:
+            if name in self._gauges:
+                return self._gauges[name]
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            data: dict[str, float] = {**self._counters, **self._gauges}
+        hits = data.get("compiled_cache_hits", 0)
+        lookups = hits + data.get("compiled_cache_misses", 0)
+        data["compiled_cache_hit_rate"] = hits / lookups if lookups else 0.0
+        data["api_bytes_saved"] = (
+            data.get("api_bytes_uncompressed", 0) - data.get("api_bytes_sent", 0)
+        )
+        return data
+
+
+def init_app(app) -> None:
+    app.extensions["metrics"] = Metrics()
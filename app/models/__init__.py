@@ -2,5 +2,7 @@ from app.db import Base
 from app.models.vehicle import Vehicle
 from app.models.dealer import Dealer
 from app.models.listing import Listing
+from app.models.data_version import DataVersion
+from app.models.price_index import PriceIndexMonthly
 
-__all__ = ["Base", "Vehicle", "Dealer", "Listing"]
+__all__ = ["Base", "Vehicle", "Dealer", "Listing", "DataVersion", "PriceIndexMonthly"]
@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+
+class DataVersion(Base):
+    """Single-row counter bumped whenever the market data is reloaded."""
+
+    __tablename__ = "data_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    loaded_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
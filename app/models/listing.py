@@ -15,6 +15,8 @@ class Listing(Base):
         primary_key=True,
         autoincrement=True,
     )
+    # Copy of vehicles.year; listings is partitioned on it (see 0003_partition_listings).
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
     vin: Mapped[str] = mapped_column(String, ForeignKey("vehicles.vin"), nullable=False)
     dealer_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("dealers.id"))
     price: Mapped[Optional[float]] = mapped_column(Numeric)
@@ -29,6 +31,7 @@ class Listing(Base):
     dealer = relationship("Dealer")
 
 
+Index("ix_listings_vin", Listing.vin)
 Index("ix_listings_price", Listing.price)
 Index("ix_listings_mileage", Listing.mileage)
 Index("ix_listings_listing_status", Listing.listing_status)
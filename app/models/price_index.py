@@ -0,0 +1,25 @@
+from datetime import date
+
+from sqlalchemy import Date, Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+
+class PriceIndexMonthly(Base):
+    """Per-(year, make, model) monthly sums for a price-vs-mileage regression.
+
+    A listing counts toward every month between its first and last seen date.
+    """
+
+    __tablename__ = "price_index_monthly"
+
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    make: Mapped[str] = mapped_column(String, primary_key=True)
+    model: Mapped[str] = mapped_column(String, primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    listings: Mapped[int] = mapped_column(Integer, nullable=False)
+    sum_mileage: Mapped[float] = mapped_column(Float, nullable=False)
+    sum_price: Mapped[float] = mapped_column(Float, nullable=False)
+    sum_mileage_sq: Mapped[float] = mapped_column(Float, nullable=False)
+    sum_mileage_price: Mapped[float] = mapped_column(Float, nullable=False)
@@ -6,10 +6,22 @@ from sqlalchemy.orm import Mapped, mapped_column
 from app.db import Base
 
 
+def squish_vin(vin: str) -> str:
+    """VIN characters 1-8 (WMI + VDS) and 10 (model year), skipping the check digit.
+
+    VINs sharing a squish VIN decode to the same year, make, model and trim.
+    """
+    return vin[:8] + vin[9:10]
+
+
 class Vehicle(Base):
     __tablename__ = "vehicles"
 
     vin: Mapped[str] = mapped_column(String, primary_key=True)
+    squish_vin: Mapped[Optional[str]] = mapped_column(
+        String,
+        default=lambda ctx: squish_vin(ctx.get_current_parameters()["vin"]),
+    )
     year: Mapped[int] = mapped_column(Integer, nullable=False)
     make: Mapped[str] = mapped_column(String, nullable=False)
     model: Mapped[str] = mapped_column(String, nullable=False)
@@ -23,3 +35,12 @@ class Vehicle(Base):
 
 
 Index("ix_vehicles_year_make_model", Vehicle.year, Vehicle.make, Vehicle.model)
+# Covers VehicleRepository.resolve_vin, so the lookup is a single index-only probe.
+Index(
+    "ix_vehicles_squish_vin",
+    Vehicle.squish_vin,
+    Vehicle.year,
+    Vehicle.make,
+    Vehicle.model,
+    Vehicle.trim,
+)
@@ -0,0 +1,15 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.data_version import DataVersion
+
+
+class DataVersionRepository:
+    """Repository for the market data version counter."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def current(self) -> int:
+        stmt = select(DataVersion.version).where(DataVersion.id == 1)
+        return self.session.execute(stmt).scalar_one_or_none() or 0
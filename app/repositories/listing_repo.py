@@ -1,6 +1,6 @@
 from typing import Optional, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import func, lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from app.models.dealer import Dealer
@@ -25,13 +25,24 @@ class ListingRepository:
         year: int,
         make: str,
         model: str,
+        trim: Optional[str] = None,
         limit: Optional[int] = None,
+        sample_cap: Optional[int] = None,
+        bucket_miles: int = 10000,
     ) -> list[Tuple[Listing, Vehicle, Optional[Dealer]]]:
-        stmt = (
-            select(Listing, Vehicle, Dealer)
+        if sample_cap is not None:
+            return self._get_sampled_comparables(
+                year, make, model, trim, sample_cap, bucket_miles)
+
+        # A lambda statement is built and compiled once; later calls only
+        # extract the bound parameters from the closure. Filtering on
+        # Listing.year lets Postgres prune to that year's partition.
+        stmt = lambda_stmt(
+            lambda: select(Listing, Vehicle, Dealer)
             .join(Vehicle, Listing.vin == Vehicle.vin)
             .join(Dealer, Listing.dealer_id == Dealer.id, isouter=True)
             .where(
+                Listing.year == year,
                 Vehicle.year == year,
                 Vehicle.make == make,
                 Vehicle.model == model,
@@ -40,7 +51,66 @@ class ListingRepository:
             )
         )
 
+        if trim is not None:
+            stmt += lambda s: s.where(Vehicle.trim == trim)
         if limit is not None:
-            stmt = stmt.limit(limit)
+            stmt += lambda s: s.limit(limit)
+
+        return list(self.session.execute(stmt).all())
+
+    def _get_sampled_comparables(
+        self,
+        year: int,
+        make: str,
+        model: str,
+        trim: Optional[str],
+        sample_cap: int,
+        bucket_miles: int,
+    ) -> list[Tuple[Listing, Vehicle, Optional[Dealer]]]:
+        """Deterministic sample of about ``sample_cap`` rows, stratified by mileage.
 
+        Each ``bucket_miles`` mileage bucket keeps ceil(bucket size * cap /
+        group size) rows, chosen by a hash of the listing id, so the sample
+        may exceed the cap by at most one row per bucket. Groups no larger
+        than the cap are returned whole. Sampling happens in the database,
+        so only the sample is transferred.
+        """
+        bucket = Listing.mileage // bucket_miles
+        filters = [
+            Listing.year == year,
+            Vehicle.year == year,
+            Vehicle.make == make,
+            Vehicle.model == model,
+            Listing.price.is_not(None),
+            Listing.mileage.is_not(None),
+        ]
+        if trim is not None:
+            filters.append(Vehicle.trim == trim)
+
+        ranked = (
+            select(
+                Listing.id.label("listing_id"),
+                func.row_number().over(
+                    partition_by=bucket,
+                    order_by=(Listing.id * 7919) % 1000003,
+                ).label("rank"),
+                func.count().over(partition_by=bucket).label("bucket_size"),
+                func.count().over().label("group_size"),
+            )
+            .join(Vehicle, Listing.vin == Vehicle.vin)
+            .where(*filters)
+            .subquery()
+        )
+        stmt = (
+            select(Listing, Vehicle, Dealer)
+            .join(ranked, ranked.c.listing_id == Listing.id)
+            .join(Vehicle, Listing.vin == Vehicle.vin)
+            .join(Dealer, Listing.dealer_id == Dealer.id, isouter=True)
+            .where(
+                Listing.year == year,
+                # rank <= ceil(bucket_size * cap / group_size), in integers
+                (ranked.c.rank - 1) * ranked.c.group_size
+                < ranked.c.bucket_size * sample_cap,
+            )
+        )
         return list(self.session.execute(stmt).all())
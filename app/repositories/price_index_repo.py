@@ -0,0 +1,36 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.models.price_index import PriceIndexMonthly
+
+
+class PriceIndexRepository:
+    """Repository for the monthly price index rollup."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_series(self, year: int, make: str, model: str) -> list[PriceIndexMonthly]:
+        stmt = (
+            select(PriceIndexMonthly)
+            .where(
+                PriceIndexMonthly.year == year,
+                PriceIndexMonthly.make == make,
+                PriceIndexMonthly.model == model,
+            )
+            .order_by(PriceIndexMonthly.month)
+        )
+        return list(self.session.execute(stmt).scalars().all())
+
+    def latest_month(self) -> Optional[date]:
+        return self.session.execute(select(func.max(PriceIndexMonthly.month))).scalar()
+
+    def delete_from(self, start_month: Optional[date]) -> None:
+        """Delete every month from ``start_month`` on (all months when None)."""
+        stmt = delete(PriceIndexMonthly)
+        if start_month is not None:
+            stmt = stmt.where(PriceIndexMonthly.month >= start_month)
+        self.session.execute(stmt)
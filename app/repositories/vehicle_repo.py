@@ -1,7 +1,9 @@
-from sqlalchemy import select
+from typing import Optional
+
+from sqlalchemy import Row, func, select
 from sqlalchemy.orm import Session
 
-from app.models.vehicle import Vehicle
+from app.models.vehicle import Vehicle, squish_vin
 
 
 class VehicleRepository:
@@ -19,3 +21,18 @@ class VehicleRepository:
         vehicle = Vehicle(vin=vin, **fields)
         self.session.add(vehicle)
         return vehicle
+
+    def resolve_vin(self, vin: str) -> Optional[Row]:
+        """Most common (year, make, model, trim) among vehicles sharing the VIN's squish VIN.
+
+        Works for VINs that are not in the table themselves; served entirely
+        from ix_vehicles_squish_vin.
+        """
+        stmt = (
+            select(Vehicle.year, Vehicle.make, Vehicle.model, Vehicle.trim)
+            .where(Vehicle.squish_vin == squish_vin(vin))
+            .group_by(Vehicle.year, Vehicle.make, Vehicle.model, Vehicle.trim)
+            .order_by(func.count().desc())
+            .limit(1)
+        )
+        return self.session.execute(stmt).first()
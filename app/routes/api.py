@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import hashlib
+
+from flask import Blueprint, current_app, jsonify, request
+
+from app.admission import Overloaded
+from app.db import get_session
+from app.routes.compression import compress_response, negotiate_encoding, supported_encodings
+from app.routes.validation import EstimateQuery, parse_estimate_query
+
+api_bp = Blueprint("api", __name__, url_prefix="/api")
+
+
+def estimate_etag(data_version: int, query: EstimateQuery) -> str:
+    """Strong validator for an estimate: same data and same query, same body."""
+    key = (
+        f"{data_version}|{query.vin}|{query.year}|{query.make}|{query.model}"
+        f"|{query.mileage}"
+    )
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+def _matching_etag(etag: str):
+    # Compressed variants carry an encoding suffix but are the same
+    # representation, so any of them revalidates. If-None-Match uses weak
+    # comparison, so a W/ validator (e.g. one weakened by a proxy) matches too.
+    for candidate in [etag] + [f"{etag}-{enc}" for enc in supported_encodings()]:
+        if request.if_none_match.contains_weak(candidate):
+            return candidate
+    return None
+
+
+def _not_modified(etag: str):
+    current_app.extensions["metrics"].incr("api_not_modified")
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    response.vary.add("Accept-Encoding")
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response
+
+
+@api_bp.get("/estimate")
+def estimate():
+    query, errors = parse_estimate_query(request.args)
+    if errors:
+        return jsonify(errors=errors), 400
+
+    # Imported on first use so app startup does not pay for NumPy and the models.
+    from app.repositories.data_version_repo import DataVersionRepository
+    from app.services.valuation_service import ValuationService
+
+    metrics = current_app.extensions["metrics"]
+    fit_cache = current_app.extensions["fit_cache"]
+    encoding = negotiate_encoding(request)
+    degraded = False
+
+    try:
+        with current_app.extensions["admission"].admit():
+            with get_session(current_app) as session:
+                data_version = fit_cache.sync_version(
+                    DataVersionRepository(session).current)
+                etag = estimate_etag(data_version, query)
+
+                matched = _matching_etag(etag)
+                if matched is not None:
+                    return _not_modified(matched)
+
+                service = ValuationService.for_app(current_app, session)
+                if query.vin:
+                    spec, result = service.estimate_by_vin(
+                        query.vin, mileage=query.mileage)
+                else:
+                    spec = None
+                    result = service.estimate_value(
+                        year=query.year,
+                        make=query.make,
+                        model=query.model,
+                        mileage=query.mileage,
+                    )
+    except Overloaded:
+        # Revalidations and cached fits can still be answered without the database.
+        data_version = fit_cache.version
+        if data_version is not None:
+            etag = estimate_etag(data_version, query)
+            matched = _matching_etag(etag)
+            if matched is not None:
+                return _not_modified(matched)
+
+        spec = None
+        result = None
+        if current_app.config["ADMISSION_DEGRADED"] and not query.vin:
+            result = ValuationService.estimate_from_cache(
+                fit_cache,
+                year=query.year,
+                make=query.make,
+                model=query.model,
+                mileage=query.mileage,
+            )
+        if result is None:
+            response = jsonify(errors=["The valuation service is overloaded."])
+            response.status_code = 503
+            response.headers["Retry-After"] = str(
+                current_app.config["ADMISSION_RETRY_AFTER"])
+            return response
+        metrics.incr("admission_degraded")
+        degraded = True
+
+    response = jsonify(
+        vin=query.vin,
+        year=spec.year if spec else query.year,
+        make=spec.make if spec else query.make,
+        model=spec.model if spec else query.model,
+        trim=spec.trim if spec else None,
+        mileage=query.mileage,
+        data_version=data_version,
+        degraded=degraded,
+        estimate=int(result.estimate) if result.estimate is not None else None,
+        comparables=[
+            {
+                "vehicle": comp.vehicle,
+                "price": float(comp.price),
+                "mileage": comp.mileage,
+                "location": comp.location,
+            }
+            for comp in result.comparables
+        ],
+    )
+    raw_bytes = len(response.get_data())
+    compress_response(response, encoding, current_app.config["API_COMPRESS_MIN_BYTES"])
+    if degraded:
+        # Possibly stale: never let a cache keep it.
+        response.cache_control.no_store = True
+    else:
+        content_encoding = response.headers.get("Content-Encoding")
+        response.set_etag(f"{etag}-{content_encoding}" if content_encoding else etag)
+        # Clients and the CDN may store the body but must revalidate it each time.
+        response.cache_control.public = True
+        response.cache_control.no_cache = True
+
+    metrics.incr("api_bytes_uncompressed", raw_bytes)
+    metrics.incr("api_bytes_sent", len(response.get_data()))
+    return response
+
+
+@api_bp.get("/trend")
+def trend():
+    query, errors = parse_estimate_query(
+        {key: request.args.get(key, "") for key in ("year", "make", "model")})
+    if errors:
+        return jsonify(errors=errors), 400
+
+    from app.services.price_index_service import PriceIndexService
+
+    with get_session(current_app) as session:
+        points = PriceIndexService(session).trend(
+            year=query.year, make=query.make, model=query.model)
+
+    return jsonify(
+        year=query.year,
+        make=query.make,
+        model=query.model,
+        points=[
+            {
+                "month": point.month.strftime("%Y-%m"),
+                "listings": point.listings,
+                "average_price": round(point.average_price, 2),
+                "adjusted_price": round(point.adjusted_price, 2),
+            }
+            for point in points
+        ],
+    )
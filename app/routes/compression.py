@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import gzip
+from typing import Optional
+
+from flask import Request, Response
+
+try:
+    import brotli
+except ImportError:  # br is only offered when the optional brotli package is installed
+    brotli = None
+
+
+def supported_encodings() -> list[str]:
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding(request: Request) -> Optional[str]:
+    return request.accept_encodings.best_match(supported_encodings())
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+def compress_response(
+    response: Response, encoding: Optional[str], min_bytes: int
+) -> Response:
+    """Encode ``response`` in place when it is worth it."""
+    body = response.get_data()
+    response.vary.add("Accept-Encoding")
+    if encoding is None or len(body) < min_bytes:
+        return response
+    response.set_data(compress(body, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+# 17 characters, digits and capital letters except I, O and Q.
+_VIN_RE = re.compile(r"^[A-HJ-NPR-Z0-9]{17}$")
+
+
+@dataclass(frozen=True)
+class EstimateQuery:
+    """Validated valuation input, with make and model normalized to upper case.
+
+    Either ``vin`` is set, or ``year``, ``make`` and ``model`` all are.
+    """
+
+    year: Optional[int] = None
+    make: Optional[str] = None
+    model: Optional[str] = None
+    mileage: Optional[int] = None
+    vin: Optional[str] = None
+
+
+def parse_estimate_query(
+    values: Mapping[str, str],
+) -> tuple[Optional[EstimateQuery], list[str]]:
+    year_raw = values.get("year", "").strip()
+    make_raw = values.get("make", "").strip()
+    model_raw = values.get("model", "").strip()
+    mileage_raw = values.get("mileage", "").strip()
+    vin_raw = values.get("vin", "").strip().upper()
+
+    errors = []
+    year = None
+    mileage = None
+
+    if vin_raw:
+        if not _VIN_RE.match(vin_raw):
+            errors.append("VIN must be 17 letters and digits.")
+    else:
+        try:
+            year = int(year_raw)
+        except ValueError:
+            errors.append("Year is required and must be a number.")
+
+        if not make_raw:
+            errors.append("Make is required.")
+        if not model_raw:
+            errors.append("Model is required.")
+
+    if mileage_raw:
+        try:
+            mileage = int(mileage_raw.replace(",", ""))
+        except ValueError:
+            errors.append("Mileage must be a number.")
+
+    if errors:
+        return None, errors
+
+    if vin_raw:
+        return EstimateQuery(mileage=mileage, vin=vin_raw), []
+
+    return (
+        EstimateQuery(
+            year=year,
+            make=make_raw.upper(),
+            model=model_raw.upper(),
+            mileage=mileage,
+        ),
+        [],
+    )
@@ -1,71 +1,133 @@
-from flask import Blueprint, current_app, redirect, render_template, request, url_for
+from flask import (
+    Blueprint,
+    current_app,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    stream_with_context,
+    url_for,
+)
+from markupsafe import Markup
 
+from app.admission import Overloaded
 from app.db import get_session
-from app.services.valuation_service import ValuationService
+from app.routes.validation import parse_estimate_query
 
 web_bp = Blueprint("web", __name__)
 
+BUSY_MESSAGE = "The valuation service is busy. Please try again in a moment."
+
+# Emitted by results.html after the estimate; ends the first flush.
+FLUSH_MARKER = Markup("<!-- flush -->")
+
+
+def stream_results(**context):
+    """Stream results.html in two chunks: the page through the estimate, then the rest.
+
+    Jinja yields one piece per template node, several per comparables row, so
+    the pieces are buffered and flushed only at the template's marker.
+    """
+    app = current_app._get_current_object()
+    template = app.jinja_env.get_template("results.html")
+    context["flush_marker"] = FLUSH_MARKER
+    app.update_template_context(context)
+
+    def generate():
+        pieces = []
+        for piece in template.generate(context):
+            if piece == FLUSH_MARKER:
+                yield "".join(pieces)
+                pieces = []
+            else:
+                pieces.append(piece)
+        yield "".join(pieces)
+
+    return app.response_class(stream_with_context(generate()))
+
 
 @web_bp.get("/")
 def search():
     return render_template("search.html")
 
 
+@web_bp.get("/metrics")
+def metrics():
+    return jsonify(current_app.extensions["metrics"].snapshot())
+
+
 @web_bp.post("/estimate")
 def estimate():
     form = request.form
-    year_raw = form.get("year", "").strip()
-    make_raw = form.get("make", "").strip()
-    model_raw = form.get("model", "").strip()
-    mileage_raw = form.get("mileage", "").strip()
+    query, errors = parse_estimate_query(form)
+    if errors:
+        return render_template("search.html", errors=errors, form=form), 400
 
-    errors = []
-    year = None
-    mileage = None
+    # Imported on first use so app startup does not pay for NumPy and the models.
+    from app.services.valuation_service import ValuationService
 
+    degraded = False
     try:
-        year = int(year_raw)
-    except ValueError:
-        errors.append("Year is required and must be a number.")
-
-    if not make_raw:
-        errors.append("Make is required.")
-    if not model_raw:
-        errors.append("Model is required.")
-
-    if mileage_raw:
-        try:
-            mileage = int(mileage_raw.replace(",", ""))
-        except ValueError:
-            errors.append("Mileage must be a number.")
+        with current_app.extensions["admission"].admit():
+            with get_session(current_app) as session:
+                service = ValuationService.for_app(current_app, session)
+                if query.vin:
+                    spec, result = service.estimate_by_vin(
+                        query.vin, mileage=query.mileage)
+                else:
+                    spec = None
+                    result = service.estimate_value(
+                        year=query.year,
+                        make=query.make,
+                        model=query.model,
+                        mileage=query.mileage,
+                    )
+    except Overloaded:
+        spec = None
+        result = None
+        if current_app.config["ADMISSION_DEGRADED"] and not query.vin:
+            result = ValuationService.estimate_from_cache(
+                current_app.extensions["fit_cache"],
+                year=query.year,
+                make=query.make,
+                model=query.model,
+                mileage=query.mileage,
+            )
+        if result is None:
+            return (
+                render_template("search.html", errors=[BUSY_MESSAGE], form=form),
+                503,
+                {"Retry-After": str(current_app.config["ADMISSION_RETRY_AFTER"])},
+            )
+        current_app.extensions["metrics"].incr("admission_degraded")
+        degraded = True
 
-    if errors:
-        return render_template("search.html", errors=errors, form=form), 400
-
-    with get_session(current_app) as session:
-        service = ValuationService(session=session)
-        result = service.estimate_value(
-            year=year,
-            make=make_raw.strip().upper(),
-            model=model_raw.strip().upper(),
-            mileage=mileage,
-        )
+    if spec is not None:
+        vehicle = {"year": spec.year, "make": spec.make,
+                   "model": spec.model, "trim": spec.trim}
+    else:
+        vehicle = {
+            "year": query.year,
+            "make": form.get("make", "").strip(),
+            "model": form.get("model", "").strip(),
+            "trim": None,
+        }
 
+    # Streamed so the page head and estimate reach the client before the
+    # comparables table is rendered.
     if result.estimate is None:
-        return render_template(
-            "results.html",
+        return stream_results(
             estimate=None,
             comparables=[],
-            year=year,
-            make=make_raw,
-            model=model_raw,
+            degraded=degraded,
+            vin=query.vin,
+            **vehicle,
         )
 
-    return render_template(
-        "results.html",
+    return stream_results(
         estimate=result.estimate,
         comparables=result.comparables,
-        year=year,
-        make=make_raw,
-        model=model_raw,
+        degraded=degraded,
+        vin=query.vin,
+        **vehicle,
     )
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class FitCache(Generic[T]):
+    """LRU cache of regression fits, invalidated when the data version changes.
+
+    The data version is re-read through ``load_version`` at most once every
+    ``version_ttl`` seconds, so a reload in another process is picked up by
+    every worker within that window.
+
+    Besides ``max_entries``, the summed ``weigh(fit)`` of the entries is kept
+    under ``max_weight`` when both are given; a single fit heavier than that
+    is not cached at all.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        version_ttl: float = 5.0,
+        max_weight: Optional[int] = None,
+        weigh: Optional[Callable[[T], int]] = None,
+    ):
+        self.max_entries = max_entries
+        self.version_ttl = version_ttl
+        self.max_weight = max_weight
+        self.weigh = weigh
+        self._lock = Lock()
+        self._entries: OrderedDict[Hashable, T] = OrderedDict()
+        self._weights: dict[Hashable, int] = {}
+        self._weight = 0
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+
+    @property
+    def weight(self) -> int:
+        return self._weight
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._version
+
+    def sync_version(self, load_version: Callable[[], int]) -> int:
+        now = time.monotonic()
+        with self._lock:
+            if self._version is not None and now - self._checked_at < self.version_ttl:
+                return self._version
+        version = load_version()
+        with self._lock:
+            if version != self._version:
+                self._clear()
+                self._version = version
+            self._checked_at = now
+            return version
+
+    def get(self, key: Hashable) -> Optional[T]:
+        with self._lock:
+            fit = self._entries.get(key)
+            if fit is not None:
+                self._entries.move_to_end(key)
+            return fit
+
+    def put(self, key: Hashable, fit: T, version: Optional[int] = None) -> None:
+        """Store ``fit``, unless it was computed against an older data version."""
+        weight = self.weigh(fit) if self.weigh is not None else 0
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            if self.max_weight is not None and weight > self.max_weight:
+                return
+            self._discard(key)
+            self._entries[key] = fit
+            self._weights[key] = weight
+            self._weight += weight
+            while len(self._entries) > self.max_entries or (
+                self.max_weight is not None and self._weight > self.max_weight
+            ):
+                self._discard(next(iter(self._entries)))
+
+    def invalidate(self) -> None:
+        """Drop every entry and force the next lookup to re-read the version."""
+        with self._lock:
+            self._clear()
+            self._version = None
+            self._checked_at = 0.0
+
+    def _discard(self, key: Hashable) -> None:
+        if self._entries.pop(key, None) is not None:
+            self._weight -= self._weights.pop(key)
+
+    def _clear(self) -> None:
+        self._entries.clear()
+        self._weights.clear()
+        self._weight = 0
+
+
+def init_app(app) -> None:
+    app.extensions["fit_cache"] = FitCache(
+        max_entries=app.config["FIT_CACHE_SIZE"],
+        version_ttl=app.config["DATA_VERSION_TTL"],
+        # Fits keep their trimmed comparables, so bound the rows held in total.
+        max_weight=app.config["FIT_CACHE_MAX_ROWS"],
+        weigh=lambda fit: len(fit.comparables),
+    )
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.repositories.price_index_repo import PriceIndexRepository
+
+
+@dataclass
+class TrendPoint:
+    month: date
+    listings: int
+    average_price: float
+    # Price predicted at the series' overall mean mileage, so months with
+    # older or newer stock stay comparable.
+    adjusted_price: float
+
+
+class PriceIndexService:
+    """Depreciation trend for a model, read from the monthly rollup."""
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.repo = PriceIndexRepository(session)
+
+    def trend(self, year: int, make: str, model: str) -> list[TrendPoint]:
+        rows = self.repo.get_series(year=year, make=make, model=model)
+        total = sum(row.listings for row in rows)
+        if not total:
+            return []
+        reference_mileage = sum(row.sum_mileage for row in rows) / total
+
+        return [
+            TrendPoint(
+                month=row.month,
+                listings=row.listings,
+                average_price=row.sum_price / row.listings,
+                adjusted_price=self._predict(row, reference_mileage),
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def _predict(row, mileage: float) -> float:
+        n = row.listings
+        mean_price = row.sum_price / n
+        slope = PriceIndexService._slope(
+            n, row.sum_mileage, row.sum_price, row.sum_mileage_sq, row.sum_mileage_price)
+        if slope is None:
+            return mean_price
+        return mean_price + slope * (mileage - row.sum_mileage / n)
+
+    @staticmethod
+    def _slope(
+        n: int, sx: float, sy: float, sxx: float, sxy: float
+    ) -> Optional[float]:
+        denominator = n * sxx - sx * sx
+        # Relative tolerance: all-equal mileages leave only rounding error here.
+        if n < 2 or denominator <= 1e-9 * n * sxx:
+            return None
+        return (n * sxy - sx * sy) / denominator
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from threading import Event, Lock
+from typing import Callable, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self):
+        self.done = Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait for it and receive the same result (or exception). A caller
+    that has waited ``wait_timeout`` seconds stops waiting and runs the function
+    itself, so a hung leader does not stall everyone behind it.
+    """
+
+    def __init__(self, metrics=None, wait_timeout: Optional[float] = None):
+        self.metrics = metrics
+        self.wait_timeout = wait_timeout
+        self._lock = Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            self._incr("singleflight_coalesced")
+            if not call.done.wait(self.wait_timeout):
+                self._incr("singleflight_wait_timeouts")
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        self._incr("singleflight_executed")
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def _incr(self, name: str) -> None:
+        if self.metrics is not None:
+            self.metrics.incr(name)
+
+
+def init_app(app) -> None:
+    app.extensions["single_flight"] = SingleFlight(
+        metrics=app.extensions["metrics"],
+        wait_timeout=app.config["SINGLE_FLIGHT_WAIT_TIMEOUT"],
+    )
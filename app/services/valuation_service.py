@@ -1,24 +1,52 @@
 from __future__ import annotations
 
+from bisect import bisect_left
 from dataclasses import dataclass
 from decimal import Decimal
+from operator import attrgetter
 from statistics import mean
-from typing import Optional
+from typing import NamedTuple, Optional
 
 import numpy as np
 from sqlalchemy.orm import Session
 
+from app.repositories.data_version_repo import DataVersionRepository
 from app.repositories.listing_repo import ListingRepository
+from app.repositories.vehicle_repo import VehicleRepository
+from app.services.fit_cache import FitCache
+from app.services.single_flight import SingleFlight
 
 
-@dataclass
-class ComparableListing:
+class ComparableListing(NamedTuple):
+    """Compact, tuple-backed row; label strings are shared between rows."""
+
     vehicle: str
     price: Decimal
     mileage: int
     location: str
 
 
+@dataclass
+class ComparableFit:
+    """Regression over a group's trimmed comparables, independent of mileage.
+
+    ``comparables`` is ordered by price.
+    """
+
+    slope: Decimal
+    intercept: Decimal
+    mean_mileage: Decimal
+    comparables: list[ComparableListing]
+
+
+@dataclass
+class VehicleSpec:
+    year: int
+    make: str
+    model: str
+    trim: Optional[str]
+
+
 @dataclass
 class ValuationResult:
     estimate: Optional[Decimal]
@@ -31,9 +59,28 @@ class ValuationService:
     def __init__(
         self,
         session: Session,
+        fit_cache: Optional[FitCache[ComparableFit]] = None,
+        single_flight: Optional[SingleFlight] = None,
+        sample_cap: Optional[int] = None,
+        sample_bucket_miles: int = 10000,
     ):
         self.session = session
         self.repo = ListingRepository(session)
+        self.fit_cache = fit_cache
+        self.single_flight = single_flight
+        self.sample_cap = sample_cap
+        self.sample_bucket_miles = sample_bucket_miles
+
+    @classmethod
+    def for_app(cls, app, session: Session) -> "ValuationService":
+        """Service wired to the app's shared caches and configuration."""
+        return cls(
+            session=session,
+            fit_cache=app.extensions["fit_cache"],
+            single_flight=app.extensions["single_flight"],
+            sample_cap=app.config["VALUATION_SAMPLE_CAP"] or None,
+            sample_bucket_miles=app.config["VALUATION_SAMPLE_BUCKET_MILES"],
+        )
 
     @staticmethod
     def _trim_outliers(
@@ -77,19 +124,159 @@ class ValuationService:
         make: str,
         model: str,
         mileage: Optional[int] = None,
+        trim: Optional[str] = None,
+    ) -> ValuationResult:
+        fit = self.get_fit(year=year, make=make, model=model, trim=trim)
+        if fit is None:
+            return ValuationResult(estimate=None, comparables=[])
+        return self._apply_fit(fit, mileage)
+
+    @classmethod
+    def estimate_from_cache(
+        cls,
+        fit_cache: FitCache[ComparableFit],
+        year: int,
+        make: str,
+        model: str,
+        mileage: Optional[int] = None,
+    ) -> Optional[ValuationResult]:
+        """Estimate from an already cached fit, without touching the database.
+
+        Used to serve degraded responses while the database is overloaded;
+        returns None when the group has not been fitted recently.
+        """
+        fit = fit_cache.get((year, make, model, None))
+        if fit is None:
+            return None
+        return cls._apply_fit(fit, mileage)
+
+    @classmethod
+    def _apply_fit(
+        cls, fit: ComparableFit, mileage: Optional[int]
     ) -> ValuationResult:
+        target_mileage = (
+            Decimal(mileage)
+            if mileage is not None
+            else fit.mean_mileage
+        )
+        estimate_value = fit.intercept + (fit.slope * target_mileage)
+
+        estimate = cls._round_to_nearest_100(estimate_value)
+
+        return ValuationResult(
+            estimate=estimate,
+            comparables=cls._nearest_comparables(fit.comparables, estimate, 100),
+        )
+
+    @staticmethod
+    def _nearest_comparables(
+        comparables: list[ComparableListing], price: Decimal, count: int
+    ) -> list[ComparableListing]:
+        """The ``count`` comparables closest to ``price``, nearest first.
+
+        ``comparables`` is sorted by price, so this walks outwards from the
+        insertion point instead of sorting the whole group. Ties go to the
+        cheaper listing.
+        """
+        right = bisect_left(comparables, price, key=attrgetter("price"))
+        left = right - 1
+        nearest = []
+        while len(nearest) < count and (left >= 0 or right < len(comparables)):
+            if right >= len(comparables) or (
+                left >= 0
+                and price - comparables[left].price <= comparables[right].price - price
+            ):
+                nearest.append(comparables[left])
+                left -= 1
+            else:
+                nearest.append(comparables[right])
+                right += 1
+        return nearest
+
+    def estimate_by_vin(
+        self,
+        vin: str,
+        mileage: Optional[int] = None,
+    ) -> tuple[Optional[VehicleSpec], ValuationResult]:
+        """Resolve ``vin`` to a vehicle through its squish VIN and value it.
+
+        Comparables are restricted to the resolved trim when it has any,
+        otherwise the whole year/make/model group is used.
+        """
+        row = VehicleRepository(self.session).resolve_vin(vin)
+        if row is None:
+            return None, ValuationResult(estimate=None, comparables=[])
+
+        spec = VehicleSpec(year=row.year, make=row.make,
+                           model=row.model, trim=row.trim)
+        result = ValuationResult(estimate=None, comparables=[])
+        if spec.trim is not None:
+            result = self.estimate_value(
+                year=spec.year,
+                make=spec.make,
+                model=spec.model,
+                mileage=mileage,
+                trim=spec.trim,
+            )
+        if result.estimate is None:
+            result = self.estimate_value(
+                year=spec.year,
+                make=spec.make,
+                model=spec.model,
+                mileage=mileage,
+            )
+        return spec, result
+
+    def get_fit(
+        self,
+        year: int,
+        make: str,
+        model: str,
+        trim: Optional[str] = None,
+    ) -> Optional[ComparableFit]:
+        key = (year, make, model, trim)
+        version = None
+        if self.fit_cache is not None:
+            version = self.fit_cache.sync_version(
+                DataVersionRepository(self.session).current)
+            fit = self.fit_cache.get(key)
+            if fit is not None:
+                return fit
+
+        def load() -> Optional[ComparableFit]:
+            fit = self._fit(year=year, make=make, model=model, trim=trim)
+            if fit is not None and self.fit_cache is not None:
+                self.fit_cache.put(key, fit, version=version)
+            return fit
+
+        if self.single_flight is None:
+            return load()
+        # Concurrent requests for the same group share one fetch and fit;
+        # each caller still applies its own mileage in estimate_value.
+        return self.single_flight.do((version, *key), load)
+
+    def _fit(
+        self,
+        year: int,
+        make: str,
+        model: str,
+        trim: Optional[str] = None,
+    ) -> Optional[ComparableFit]:
         rows = self.repo.get_comparables(
             year=year,
             make=make,
             model=model,
+            trim=trim,
+            sample_cap=self.sample_cap,
+            bucket_miles=self.sample_bucket_miles,
         )
         if not rows:
-            return ValuationResult(estimate=None, comparables=[])
+            return None
 
         sorted_rows = sorted(rows, key=lambda row: row[0].price)
         trimmed_rows = self._trim_outliers(sorted_rows, 1.0)
         if not trimmed_rows:
-            return ValuationResult(estimate=None, comparables=[])
+            return None
 
         trimmed_prices = [
             row[0].price for row in trimmed_rows if row[0].price is not None
@@ -99,43 +286,46 @@ class ValuationService:
         ]
 
         if not trimmed_prices or not trimmed_mileages:
-            return ValuationResult(estimate=None, comparables=[])
+            return None
 
         slope, intercept = self._linear_regression(
             trimmed_mileages, trimmed_prices)
-        target_mileage = (
-            Decimal(mileage)
-            if mileage is not None
-            else Decimal(str(mean(trimmed_mileages)))
-        )
-        estimate_value = intercept + (slope * target_mileage)
-
-        estimate = self._round_to_nearest_100(estimate_value)
 
-        closest_rows = sorted(
-            trimmed_rows,
-            key=lambda row: abs(row[0].price - estimate),
-        )[:100]
+        # One label string per (year, make, model, trim) and per dealer,
+        # instead of one per row.
+        labels: dict[tuple, str] = {}
+        locations: dict[Optional[int], str] = {None: ""}
         comparables = []
-        for listing, vehicle, dealer in closest_rows:
-            label = f"{vehicle.year} {vehicle.make} {vehicle.model}"
-            if vehicle.trim:
-                label = f"{label} {vehicle.trim}"
-            location = ""
-            if dealer:
+        for listing, vehicle, dealer in trimmed_rows:
+            label_key = (vehicle.year, vehicle.make, vehicle.model, vehicle.trim)
+            label = labels.get(label_key)
+            if label is None:
+                label = f"{vehicle.year} {vehicle.make} {vehicle.model}"
+                if vehicle.trim:
+                    label = f"{label} {vehicle.trim}"
+                labels[label_key] = label
+            dealer_id = dealer.id if dealer else None
+            location = locations.get(dealer_id)
+            if location is None:
                 city = dealer.city or ""
                 state = dealer.state or ""
                 if city and state:
                     location = f"{city}, {state}"
                 else:
                     location = city or state
+                locations[dealer_id] = location
             comparables.append(
                 ComparableListing(
-                    vehicle=label,
-                    price=listing.price,
-                    mileage=listing.mileage or 0,
-                    location=location,
+                    label,
+                    listing.price,
+                    listing.mileage or 0,
+                    location,
                 )
             )
 
-        return ValuationResult(estimate=estimate, comparables=comparables)
+        return ComparableFit(
+            slope=slope,
+            intercept=intercept,
+            mean_mileage=Decimal(str(mean(trimmed_mileages))),
+            comparables=comparables,
+        )
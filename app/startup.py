@@ -0,0 +1,106 @@
+"""Cold-start measurement for the application.
+
+Run ``python -m app.startup`` to print the import and init cost of each
+application module. Measurements are taken in a fresh interpreter using
+``-X importtime`` so modules already loaded by the caller do not hide their cost.
+
+Flask and SQLAlchemy are imported first and timed on their own, so what the
+application adds on top of the framework it cannot avoid is reported apart.
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+_PROBE = """
+import time
+start = time.perf_counter()
+import flask, sqlalchemy.orm
+framework = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+create_app()
+done = time.perf_counter()
+import sys
+print(
+    f"{(framework - start) * 1000:.3f} {(imported - framework) * 1000:.3f} "
+    f"{(done - imported) * 1000:.3f}"
+)
+print(" ".join(sorted(sys.modules)))
+"""
+
+
+@dataclass
+class StartupReport:
+    # Importing Flask and SQLAlchemy, before any application module.
+    framework_ms: float
+    # Importing ``app`` on top of the framework, then ``create_app()``.
+    import_ms: float
+    init_ms: float
+    # Cumulative import time per module, in milliseconds.
+    module_ms: dict[str, float] = field(default_factory=dict)
+    loaded_modules: set[str] = field(default_factory=set)
+
+    @property
+    def app_ms(self) -> float:
+        return self.import_ms + self.init_ms
+
+    @property
+    def total_ms(self) -> float:
+        return self.framework_ms + self.app_ms
+
+
+def _parse_importtime(stderr: str) -> dict[str, float]:
+    module_ms = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cumulative_us = int(parts[1])
+        except ValueError:
+            continue
+        module_ms[parts[2].strip()] = cumulative_us / 1000
+    return module_ms
+
+
+def measure_startup() -> StartupReport:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        capture_output=True,
+        text=True,
+        cwd=root,
+        check=True,
+    )
+    timings, modules = proc.stdout.strip().splitlines()[-2:]
+    framework_ms, import_ms, init_ms = (float(value) for value in timings.split())
+    return StartupReport(
+        framework_ms=framework_ms,
+        import_ms=import_ms,
+        init_ms=init_ms,
+        module_ms=_parse_importtime(proc.stderr),
+        loaded_modules=set(modules.split()),
+    )
+
+
+def main() -> None:
+    report = measure_startup()
+    top_level = {
+        name: ms for name, ms in report.module_ms.items()
+        if "." not in name or name.startswith("app.")
+    }
+    for name, ms in sorted(top_level.items(), key=lambda item: -item[1])[:25]:
+        print(f"{ms:10.2f} ms  {name}")
+    print(f"{report.framework_ms:10.2f} ms  import flask, sqlalchemy")
+    print(f"{report.import_ms:10.2f} ms  import app")
+    print(f"{report.init_ms:10.2f} ms  create_app()")
+    print(f"{report.total_ms:10.2f} ms  total")
+
+
+if __name__ == "__main__":
+    main()
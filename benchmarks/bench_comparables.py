@@ -0,0 +1,127 @@
+"""Per-query overhead of the comparables lookup for small groups.
+
+Compares a freshly built ``select()`` per call with the cached lambda
+statement used by ``ListingRepository.get_comparables``. Groups are kept
+small so statement construction and planning dominate execution time.
+
+    python benchmarks/bench_comparables.py --queries 20000
+    BENCH_DATABASE_URL=postgresql+psycopg://.../scratch python benchmarks/bench_comparables.py
+
+``BENCH_DATABASE_URL`` must point at a scratch database: the benchmark creates
+and drops the application tables there. SQLite in a temp dir is the default.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select  # noqa: E402
+
+from app.db import Base, SessionLocal, get_engine, instrument_engine  # noqa: E402
+from app.metrics import Metrics  # noqa: E402
+from app.models import Dealer, Listing, Vehicle  # noqa: E402
+from app.repositories.listing_repo import ListingRepository  # noqa: E402
+
+MAKES = ["TOYOTA", "HONDA", "FORD", "CHEVROLET"]
+MODELS = ["A", "B", "C", "D", "E"]
+YEARS = range(2010, 2020)
+
+
+def seed(session, group_size: int) -> None:
+    dealer = Dealer(name="Dealer", city="Austin", state="TX")
+    session.add(dealer)
+    session.flush()
+    idx = 0
+    for year in YEARS:
+        for make in MAKES:
+            for model in MODELS:
+                for _ in range(group_size):
+                    vin = f"BENCH{idx:012d}"
+                    session.add(Vehicle(vin=vin, year=year, make=make, model=model))
+                    session.add(
+                        Listing(
+                            vin=vin,
+                            year=year,
+                            dealer_id=dealer.id,
+                            price=Decimal(10000 + idx % 5000),
+                            mileage=20000 + idx % 80000,
+                        )
+                    )
+                    idx += 1
+    session.commit()
+
+
+def uncached_comparables(session, year: int, make: str, model: str):
+    stmt = (
+        select(Listing, Vehicle, Dealer)
+        .join(Vehicle, Listing.vin == Vehicle.vin)
+        .join(Dealer, Listing.dealer_id == Dealer.id, isouter=True)
+        .where(
+            Listing.year == year,
+            Vehicle.year == year,
+            Vehicle.make == make,
+            Vehicle.model == model,
+            Listing.price.is_not(None),
+            Listing.mileage.is_not(None),
+        )
+    )
+    return list(session.execute(stmt).all())
+
+
+def run(label: str, fn, session, queries: int) -> None:
+    keys = [(y, mk, md) for y in YEARS for mk in MAKES for md in MODELS]
+    start = time.perf_counter()
+    for i in range(queries):
+        year, make, model = keys[i % len(keys)]
+        fn(session, year, make, model)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<10} {elapsed / queries * 1e6:9.1f} us/query  "
+        f"{queries / elapsed:9.0f} qps"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--group-size", type=int, default=5)
+    parser.add_argument("--prepare-threshold", type=int, default=1)
+    args = parser.parse_args()
+
+    database_url = os.environ.get("BENCH_DATABASE_URL")
+    tmpdir = None
+    if not database_url:
+        tmpdir = tempfile.TemporaryDirectory()
+        database_url = f"sqlite:///{tmpdir.name}/bench.db"
+
+    engine = get_engine(database_url, prepare_threshold=args.prepare_threshold)
+    metrics = Metrics()
+    instrument_engine(engine, metrics)
+    Base.metadata.create_all(bind=engine)
+
+    with SessionLocal(bind=engine) as session:
+        seed(session, args.group_size)
+        repo = ListingRepository(session)
+
+        def cached(session, year, make, model):
+            return repo.get_comparables(year=year, make=make, model=model)
+
+        run("select()", uncached_comparables, session, args.queries)
+        run("lambda", cached, session, args.queries)
+
+    snapshot = metrics.snapshot()
+    print(f"compiled cache hit rate: {snapshot['compiled_cache_hit_rate']:.3f}")
+
+    Base.metadata.drop_all(bind=engine)
+    if tmpdir is not None:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
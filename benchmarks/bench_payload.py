@@ -0,0 +1,83 @@
+"""Bytes on the wire for one valuation, HTML page vs JSON API.
+
+Seeds a group large enough to fill the 100-row comparables table and reports
+the response size of the results page, the JSON body in each encoding, and a
+304 revalidation.
+
+    python benchmarks/bench_payload.py --group-size 500
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from app.db import Base, app_engine, get_session  # noqa: E402
+from app.models import Dealer, Listing, Vehicle  # noqa: E402
+
+
+def seed(session, group_size: int) -> None:
+    dealers = [
+        Dealer(name=f"Dealer {idx}", city=f"City {idx}", state="TX")
+        for idx in range(20)
+    ]
+    session.add_all(dealers)
+    session.flush()
+    for idx in range(group_size):
+        vin = f"BENCH{idx:012d}"
+        session.add(
+            Vehicle(vin=vin, year=2018, make="TOYOTA", model="CAMRY", trim="LE")
+        )
+        session.add(
+            Listing(
+                vin=vin,
+                year=2018,
+                dealer_id=dealers[idx % len(dealers)].id,
+                price=Decimal(15000 + (idx * 37) % 4000),
+                mileage=20000 + (idx * 811) % 80000,
+            )
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--group-size", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        app = create_app()
+        app.config["DATABASE_URL"] = f"sqlite:///{tmpdir}/bench.db"
+        Base.metadata.create_all(bind=app_engine(app))
+        with get_session(app) as session:
+            seed(session, args.group_size)
+
+        client = app.test_client()
+        form = {"year": "2018", "make": "Toyota", "model": "Camry"}
+        url = "/api/estimate?year=2018&make=Toyota&model=Camry"
+
+        html = client.post("/estimate", data=form)
+        rows = [("HTML results page", len(html.data))]
+        for encoding in ("identity", "gzip", "br"):
+            resp = client.get(url, headers={"Accept-Encoding": encoding})
+            if encoding != "identity" and resp.headers.get("Content-Encoding") != encoding:
+                continue
+            rows.append((f"JSON ({encoding})", len(resp.data)))
+            etag = resp.headers["ETag"]
+        not_modified = client.get(url, headers={"If-None-Match": etag})
+        rows.append(("JSON 304 revalidation", len(not_modified.data)))
+
+        baseline = rows[0][1]
+        for label, size in rows:
+            print(f"{label:<24} {size:8d} bytes  {size / baseline:6.1%} of HTML")
+
+        snapshot = app.extensions["metrics"].snapshot()
+        print(f"api_bytes_saved: {snapshot['api_bytes_saved']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Allocation of a fit and time-to-first-byte of the results page.
+
+Seeds one comparable group, then measures the shipped code paths: the memory
+a ``ValuationService._fit`` result keeps alive (what the fit cache holds), and
+``POST /estimate`` through the test client, timing the chunk that carries the
+estimate against the whole page. Page timings are with the fit already cached.
+
+    python benchmarks/bench_results_page.py --group-size 5000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from app.db import Base, app_engine, get_session  # noqa: E402
+from app.models import Dealer, Listing, Vehicle  # noqa: E402
+from app.services.valuation_service import ValuationService  # noqa: E402
+
+TRIMS = ["LE", "SE", "XLE", None]
+
+
+def seed(session, group_size: int) -> None:
+    dealers = [
+        Dealer(name=f"Dealer {idx}", city=f"City {idx}", state="TX")
+        for idx in range(40)
+    ]
+    session.add_all(dealers)
+    session.flush()
+    for idx in range(group_size):
+        vin = f"BENCH{idx:012d}"
+        session.add(
+            Vehicle(vin=vin, year=2018, make="TOYOTA", model="CAMRY",
+                    trim=TRIMS[idx % len(TRIMS)])
+        )
+        session.add(
+            Listing(
+                vin=vin,
+                year=2018,
+                dealer_id=dealers[idx % len(dealers)].id,
+                price=Decimal(15000 + (idx * 37) % 4000),
+                mileage=20000 + (idx * 811) % 80000,
+            )
+        )
+
+
+def measure_fit(app) -> tuple[int, int, float]:
+    """Bytes kept alive by one fit, its comparable count, and seconds to build it."""
+    with get_session(app) as session:
+        service = ValuationService(session=session)
+        # Warm the statement cache so only the fit itself is traced.
+        service._fit(year=2018, make="TOYOTA", model="CAMRY")
+        tracemalloc.start()
+        start = time.perf_counter()
+        fit = service._fit(year=2018, make="TOYOTA", model="CAMRY")
+        elapsed = time.perf_counter() - start
+        session.expunge_all()
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return retained, len(fit.comparables), elapsed
+
+
+def measure_page(client, repeat: int) -> tuple[float, float, int]:
+    form = {"year": "2018", "make": "Toyota", "model": "Camry"}
+    client.post("/estimate", data=form).close()
+    estimate_chunk = total = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        resp = client.post("/estimate", data=form, buffered=False)
+        chunks = 0
+        for chunk in resp.iter_encoded():
+            chunks += 1
+            if b"Estimated Market Value" in chunk:
+                estimate_chunk += time.perf_counter() - start
+        resp.close()
+        total += time.perf_counter() - start
+    return estimate_chunk / repeat, total / repeat, chunks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--group-size", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        app = create_app()
+        app.config["DATABASE_URL"] = f"sqlite:///{tmpdir}/bench.db"
+        Base.metadata.create_all(bind=app_engine(app))
+        with get_session(app) as session:
+            seed(session, args.group_size)
+
+        retained, rows, elapsed = measure_fit(app)
+        print(
+            f"_fit        {rows} comparables: {retained / 1024:8.1f} KiB retained "
+            f"({retained / rows:5.0f} B/row)  {elapsed * 1000:7.2f} ms"
+        )
+
+        ttfb, total, chunks = measure_page(app.test_client(), args.repeat)
+        print(
+            f"/estimate   estimate chunk {ttfb * 1000:6.3f} ms  "
+            f"(full page {total * 1000:6.3f} ms in {chunks} chunks)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Estimate error and latency of stratified sampling against the full fit.
+
+Seeds one large comparable group with a linear price/mileage trend plus noise,
+then values it at several mileages with sampling off and at each cap.
+
+    python benchmarks/bench_sampling.py --group-size 50000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.db import Base, SessionLocal, get_engine  # noqa: E402
+from app.models import Listing, Vehicle  # noqa: E402
+from app.services.valuation_service import ValuationService  # noqa: E402
+
+CAPS = [250, 500, 1000, 2500, 5000, 10000]
+MILEAGES = [None, 20000, 60000, 120000]
+
+
+def seed(session, group_size: int) -> None:
+    rng = random.Random(42)
+    vehicles = []
+    listings = []
+    for idx in range(group_size):
+        vin = f"BENCH{idx:012d}"
+        mileage = int(rng.triangular(0, 200000, 40000))
+        price = 32000 - 0.09 * mileage + rng.gauss(0, 1800)
+        vehicles.append(
+            {"vin": vin, "squish_vin": vin[:8] + vin[9:10], "year": 2018,
+             "make": "TOYOTA", "model": "CAMRY"}
+        )
+        listings.append(
+            {"vin": vin, "year": 2018, "price": Decimal(f"{price:.2f}"),
+             "mileage": mileage}
+        )
+    session.execute(insert(Vehicle), vehicles)
+    session.execute(insert(Listing), listings)
+    session.commit()
+
+
+def run(session, sample_cap, repeat: int):
+    service = ValuationService(session=session, sample_cap=sample_cap)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        estimates = [
+            service.estimate_value(
+                year=2018, make="TOYOTA", model="CAMRY", mileage=mileage
+            ).estimate
+            for mileage in MILEAGES
+        ]
+    elapsed = (time.perf_counter() - start) / (repeat * len(MILEAGES))
+    return estimates, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--group-size", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = get_engine(f"sqlite:///{tmpdir}/bench.db")
+        Base.metadata.create_all(bind=engine)
+        with SessionLocal(bind=engine) as session:
+            seed(session, args.group_size)
+
+            full, full_latency = run(session, None, args.repeat)
+            print(f"{'cap':>8} {'ms/estimate':>12} {'max abs err':>12} {'max rel err':>12}")
+            print(f"{'full':>8} {full_latency * 1000:12.1f} {0:12.0f} {0:12.2%}")
+            for cap in CAPS:
+                estimates, latency = run(session, cap, args.repeat)
+                errors = [abs(est - ref) for est, ref in zip(estimates, full)]
+                rel = max(err / ref for err, ref in zip(errors, full))
+                print(
+                    f"{cap:>8} {latency * 1000:12.1f} {max(errors):12.0f} {rel:12.2%}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""partition listings by model year
+
+Revision ID: 0003_partition_listings
+Revises: 0002_create_tables
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_partition_listings"
+down_revision = "0002_create_tables"
+branch_labels = None
+depends_on = None
+
+
+LISTING_INDEXES = [
+    ("ix_listings_vin", ["vin"]),
+    ("ix_listings_price", ["price"]),
+    ("ix_listings_mileage", ["mileage"]),
+    ("ix_listings_listing_status", ["listing_status"]),
+    ("ix_listings_last_seen_date", ["last_seen_date"]),
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    op.drop_index("ix_listings_last_seen_date", table_name="listings")
+    op.drop_index("ix_listings_listing_status", table_name="listings")
+    op.drop_index("ix_listings_mileage", table_name="listings")
+    op.drop_index("ix_listings_price", table_name="listings")
+    op.rename_table("listings", "listings_unpartitioned")
+    op.execute("ALTER SEQUENCE listings_id_seq RENAME TO listings_unpartitioned_id_seq")
+
+    # The partition key has to be part of the primary key, and the valuation
+    # query filters on it directly so the planner prunes to one partition.
+    op.execute(
+        """
+        CREATE TABLE listings (
+            id BIGSERIAL NOT NULL,
+            year INTEGER NOT NULL,
+            vin VARCHAR NOT NULL REFERENCES vehicles (vin),
+            dealer_id INTEGER REFERENCES dealers (id),
+            price NUMERIC,
+            mileage INTEGER,
+            used BOOLEAN,
+            certified BOOLEAN,
+            first_seen_date DATE,
+            last_seen_date DATE,
+            listing_status VARCHAR,
+            PRIMARY KEY (year, id)
+        ) PARTITION BY LIST (year)
+        """
+    )
+
+    years = bind.execute(
+        sa.text("SELECT DISTINCT year FROM vehicles ORDER BY year")
+    ).scalars()
+    for year in years:
+        op.execute(
+            f"CREATE TABLE listings_y{int(year)} PARTITION OF listings "
+            f"FOR VALUES IN ({int(year)})"
+        )
+    op.execute("CREATE TABLE listings_default PARTITION OF listings DEFAULT")
+
+    op.execute(
+        """
+        INSERT INTO listings (
+            id,
+            year,
+            vin,
+            dealer_id,
+            price,
+            mileage,
+            used,
+            certified,
+            first_seen_date,
+            last_seen_date,
+            listing_status
+        )
+        SELECT
+            l.id,
+            v.year,
+            l.vin,
+            l.dealer_id,
+            l.price,
+            l.mileage,
+            l.used,
+            l.certified,
+            l.first_seen_date,
+            l.last_seen_date,
+            l.listing_status
+        FROM listings_unpartitioned l
+        JOIN vehicles v ON v.vin = l.vin
+        """
+    )
+    op.execute(
+        "SELECT setval('listings_id_seq', COALESCE((SELECT MAX(id) FROM listings), 1))"
+    )
+    op.drop_table("listings_unpartitioned")
+
+    # Indexes created on the partitioned parent cascade to every partition.
+    for name, columns in LISTING_INDEXES:
+        op.create_index(name, "listings", columns)
+
+    # Per-year partition loads read the staging table by year.
+    op.create_index("ix_market_listings_raw_year", "market_listings_raw", ["year"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_market_listings_raw_year", table_name="market_listings_raw")
+    for name, _ in reversed(LISTING_INDEXES):
+        op.drop_index(name, table_name="listings")
+    op.rename_table("listings", "listings_partitioned")
+    op.execute("ALTER SEQUENCE listings_id_seq RENAME TO listings_partitioned_id_seq")
+
+    op.create_table(
+        "listings",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("vin", sa.String(), sa.ForeignKey(
+            "vehicles.vin"), nullable=False),
+        sa.Column("dealer_id", sa.Integer(), sa.ForeignKey("dealers.id")),
+        sa.Column("price", sa.Numeric()),
+        sa.Column("mileage", sa.Integer()),
+        sa.Column("used", sa.Boolean()),
+        sa.Column("certified", sa.Boolean()),
+        sa.Column("first_seen_date", sa.Date()),
+        sa.Column("last_seen_date", sa.Date()),
+        sa.Column("listing_status", sa.String()),
+    )
+    op.execute(
+        """
+        INSERT INTO listings (
+            id,
+            vin,
+            dealer_id,
+            price,
+            mileage,
+            used,
+            certified,
+            first_seen_date,
+            last_seen_date,
+            listing_status
+        )
+        SELECT
+            id,
+            vin,
+            dealer_id,
+            price,
+            mileage,
+            used,
+            certified,
+            first_seen_date,
+            last_seen_date,
+            listing_status
+        FROM listings_partitioned
+        """
+    )
+    op.execute(
+        "SELECT setval('listings_id_seq', COALESCE((SELECT MAX(id) FROM listings), 1))"
+    )
+    op.execute("DROP TABLE listings_partitioned CASCADE")
+
+    op.create_index("ix_listings_price", "listings", ["price"])
+    op.create_index("ix_listings_mileage", "listings", ["mileage"])
+    op.create_index("ix_listings_listing_status",
+                    "listings", ["listing_status"])
+    op.create_index("ix_listings_last_seen_date",
+                    "listings", ["last_seen_date"])
@@ -0,0 +1,28 @@
+"""data version counter
+
+Revision ID: 0004_data_version
+Revises: 0003_partition_listings
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_data_version"
+down_revision = "0003_partition_listings"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "data_version",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("loaded_at", sa.DateTime(timezone=True)),
+    )
+    op.execute("INSERT INTO data_version (id, version, loaded_at) VALUES (1, 1, now())")
+
+
+def downgrade() -> None:
+    op.drop_table("data_version")
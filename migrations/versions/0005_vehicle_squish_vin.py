@@ -0,0 +1,29 @@
+"""squish VIN index on vehicles
+
+Revision ID: 0005_vehicle_squish_vin
+Revises: 0004_data_version
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_vehicle_squish_vin"
+down_revision = "0004_data_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("vehicles", sa.Column("squish_vin", sa.String()))
+    op.execute("UPDATE vehicles SET squish_vin = SUBSTR(vin, 1, 8) || SUBSTR(vin, 10, 1)")
+    op.create_index(
+        "ix_vehicles_squish_vin",
+        "vehicles",
+        ["squish_vin", "year", "make", "model", "trim"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vehicles_squish_vin", table_name="vehicles")
+    op.drop_column("vehicles", "squish_vin")
@@ -0,0 +1,33 @@
+"""monthly price index rollup
+
+Revision ID: 0006_price_index_monthly
+Revises: 0005_vehicle_squish_vin
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_price_index_monthly"
+down_revision = "0005_vehicle_squish_vin"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "price_index_monthly",
+        sa.Column("year", sa.Integer(), primary_key=True),
+        sa.Column("make", sa.String(), primary_key=True),
+        sa.Column("model", sa.String(), primary_key=True),
+        sa.Column("month", sa.Date(), primary_key=True),
+        sa.Column("listings", sa.Integer(), nullable=False),
+        sa.Column("sum_mileage", sa.Float(), nullable=False),
+        sa.Column("sum_price", sa.Float(), nullable=False),
+        sa.Column("sum_mileage_sq", sa.Float(), nullable=False),
+        sa.Column("sum_mileage_price", sa.Float(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("price_index_monthly")
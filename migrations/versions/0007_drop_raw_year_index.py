@@ -0,0 +1,23 @@
+"""drop unused market_listings_raw year index
+
+Revision ID: 0007_drop_raw_year_index
+Revises: 0006_price_index_monthly
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+revision = "0007_drop_raw_year_index"
+down_revision = "0006_price_index_monthly"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-year partition loads select rows by the decoded vehicles.year, so
+    # nothing reads the raw table by its own year; the index only slowed \copy.
+    op.drop_index("ix_market_listings_raw_year", table_name="market_listings_raw")
+
+
+def downgrade() -> None:
+    op.create_index("ix_market_listings_raw_year", "market_listings_raw", ["year"])
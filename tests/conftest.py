@@ -1,9 +1,19 @@
 import os
 
 import pytest
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from sqlalchemy import text
 
 from app import create_app
+from app.config import Config
 from app.db import Base, get_engine, init_app, get_session
+from app.ingestion.reload import RETIRED_SCHEMA, SHADOW_SCHEMA
+
+# Partition and schema swaps are Postgres-only; point this at a scratch
+# database, which every test using pg_engine wipes afterwards.
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
 @pytest.fixture()
@@ -31,3 +41,23 @@ def client(app):
 def session(app):
     with get_session(app) as session:
         yield session
+
+
+@pytest.fixture()
+def pg_engine(monkeypatch):
+    if not POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    monkeypatch.setattr(Config, "DATABASE_URL", POSTGRES_URL)
+    alembic_cfg = AlembicConfig(os.path.join(ROOT, "alembic.ini"))
+    alembic_cfg.set_main_option("script_location", os.path.join(ROOT, "migrations"))
+    command.upgrade(alembic_cfg, "head")
+
+    engine = get_engine(POSTGRES_URL)
+    yield engine
+
+    with engine.begin() as conn:
+        for schema in (SHADOW_SCHEMA, RETIRED_SCHEMA):
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        conn.execute(text("DROP SCHEMA public CASCADE"))
+        conn.execute(text("CREATE SCHEMA public"))
+    engine.dispose()
@@ -0,0 +1,95 @@
+import time
+from decimal import Decimal
+from threading import Thread
+
+import pytest
+
+from app.admission import AdmissionController, Overloaded
+from app.metrics import Metrics
+from app.models.listing import Listing
+from app.models.vehicle import Vehicle
+
+
+def seed_listings(session):
+    for idx, price in enumerate([15000, 16000, 17000]):
+        vin = f"VIN{idx}"
+        session.add(Vehicle(vin=vin, year=2018, make="TOYOTA", model="CAMRY"))
+        session.add(Listing(vin=vin, year=2018, price=Decimal(price), mileage=40000 + idx * 5000))
+    session.commit()
+
+
+def saturate(app):
+    admission = app.extensions["admission"]
+    admission.limit = 1
+    admission.queue_timeout = 0.01
+    return admission.admit()
+
+
+def test_sheds_after_queue_deadline():
+    metrics = Metrics()
+    controller = AdmissionController(limit=1, queue_timeout=0.01, max_queue=5, metrics=metrics)
+
+    with controller.admit():
+        with pytest.raises(Overloaded):
+            with controller.admit():
+                pass
+
+    assert metrics.get("admission_shed") == 1
+    assert metrics.get("admission_queue_depth") == 0
+    assert metrics.get("admission_in_flight") == 0
+
+
+def test_queued_request_gets_freed_slot():
+    controller = AdmissionController(limit=1, queue_timeout=5, max_queue=5)
+
+    def hold():
+        with controller.admit():
+            time.sleep(0.05)
+
+    holder = Thread(target=hold)
+    holder.start()
+    time.sleep(0.01)
+    with controller.admit():
+        pass
+    holder.join()
+
+
+def test_full_queue_is_shed_immediately():
+    controller = AdmissionController(limit=1, queue_timeout=5, max_queue=0)
+
+    with controller.admit():
+        start = time.monotonic()
+        with pytest.raises(Overloaded):
+            with controller.admit():
+                pass
+
+    assert time.monotonic() - start < 1
+
+
+def test_estimate_returns_503_when_saturated(app, client, session):
+    seed_listings(session)
+
+    with saturate(app):
+        resp = client.post("/estimate", data={"year": "2018", "make": "Toyota", "model": "Camry"})
+
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "2"
+
+
+def test_estimate_serves_cached_fit_when_saturated(app, client, session):
+    seed_listings(session)
+    url = "/api/estimate?year=2018&make=Toyota&model=Camry"
+    fresh = client.get(url)
+
+    with saturate(app):
+        resp = client.get(url + "&mileage=60000")
+        page = client.post("/estimate", data={"year": "2018", "make": "Toyota", "model": "Camry"})
+
+    assert resp.status_code == 200
+    assert resp.json["degraded"] is True
+    assert resp.json["estimate"] is not None
+    assert "no-store" in resp.headers["Cache-Control"]
+    assert page.status_code == 200
+    assert b"heavy load" in page.data
+    assert fresh.json["degraded"] is False
+    assert client.get("/metrics").json["admission_degraded"] == 2
@@ -0,0 +1,103 @@
+import gzip
+from decimal import Decimal
+
+from app.models.dealer import Dealer
+from app.models.listing import Listing
+from app.models.vehicle import Vehicle
+
+
+def seed_listings(session, count=3):
+    dealer = Dealer(name="Dealer", street=None, city="Austin", state="TX", zip=None, website=None)
+    session.add(dealer)
+    session.flush()
+
+    for idx in range(count):
+        vin = f"VIN{idx}"
+        session.add(Vehicle(vin=vin, year=2018, make="TOYOTA", model="CAMRY", trim="LE"))
+        session.add(
+            Listing(
+                vin=vin,
+                year=2018,
+                dealer_id=dealer.id,
+                price=Decimal(15000 + idx * 500),
+                mileage=40000 + idx * 5000,
+                used=True,
+                certified=False,
+                listing_status="active",
+            )
+        )
+    session.commit()
+
+
+def test_api_estimate_returns_json(client, session):
+    seed_listings(session)
+    resp = client.get("/api/estimate?year=2018&make=Toyota&model=Camry")
+
+    assert resp.status_code == 200
+    assert resp.json["estimate"] is not None
+    assert resp.json["make"] == "TOYOTA"
+    assert resp.json["comparables"][0]["location"] == "Austin, TX"
+    assert resp.headers["ETag"]
+
+
+def test_api_estimate_validation_errors(client):
+    resp = client.get("/api/estimate?make=Toyota")
+
+    assert resp.status_code == 400
+    assert "Model is required." in resp.json["errors"]
+
+
+def test_api_estimate_not_modified(client, session):
+    seed_listings(session)
+    url = "/api/estimate?year=2018&make=Toyota&model=Camry&mileage=50000"
+    first = client.get(url)
+
+    resp = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    other = client.get(
+        "/api/estimate?year=2018&make=Toyota&model=Camry&mileage=60000",
+        headers={"If-None-Match": first.headers["ETag"]},
+    )
+
+    assert resp.status_code == 304
+    assert resp.data == b""
+    assert other.status_code == 200
+    assert client.get("/metrics").json["api_not_modified"] == 1
+
+
+def test_api_estimate_not_modified_weak_etag(client, session):
+    seed_listings(session)
+    url = "/api/estimate?year=2018&make=Toyota&model=Camry&mileage=50000"
+    etag = client.get(url).headers["ETag"]
+
+    resp = client.get(url, headers={"If-None-Match": f"W/{etag}"})
+
+    assert resp.status_code == 304
+
+
+def test_api_estimate_gzip(app, client, session):
+    seed_listings(session)
+    app.config["API_COMPRESS_MIN_BYTES"] = 0
+    url = "/api/estimate?year=2018&make=Toyota&model=Camry"
+    plain = client.get(url)
+
+    resp = client.get(url, headers={"Accept-Encoding": "gzip"})
+    revalidated = client.get(
+        url, headers={"Accept-Encoding": "gzip", "If-None-Match": resp.headers["ETag"]})
+
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(resp.data) == plain.data
+    assert resp.headers["ETag"] != plain.headers["ETag"]
+    assert revalidated.status_code == 304
+
+
+def test_api_estimate_by_vin(client, session):
+    session.add(Vehicle(vin="4T1BF1FK5JU000001", year=2018, make="TOYOTA", model="CAMRY", trim="SE"))
+    session.add(Listing(vin="4T1BF1FK5JU000001", year=2018, price=Decimal("21000"), mileage=30000))
+    session.commit()
+
+    resp = client.get("/api/estimate?vin=4T1BF1FK9JU123456")
+
+    assert resp.status_code == 200
+    assert resp.json["model"] == "CAMRY"
+    assert resp.json["trim"] == "SE"
+    assert resp.json["estimate"] == 21000
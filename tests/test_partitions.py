@@ -0,0 +1,86 @@
+import pytest
+from sqlalchemy import text
+
+from app.ingestion.partitions import load_year_partition
+
+
+@pytest.fixture()
+def pg_engine(pg_engine):
+    with pg_engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO vehicles (vin, squish_vin, year, make, model) VALUES "
+                "('1HGCM82633A004352', '1HGCM826A', 2018, 'HONDA', 'ACCORD'), "
+                "('1HGCM82633A004353', '1HGCM826A', 2018, 'HONDA', 'ACCORD')"
+            )
+        )
+        # The feed's year is off by one for the second VIN; the decoded
+        # vehicle year decides the partition.
+        conn.execute(
+            text(
+                "INSERT INTO market_listings_raw "
+                "(vin, year, listing_price, listing_mileage) VALUES "
+                "(' 1hgcm82633a004352 ', 2018, 18000, 30000), "
+                "('1HGCM82633A004353', 2017, 17000, 45000)"
+            )
+        )
+    return pg_engine
+
+
+def partition_counts(engine):
+    with engine.connect() as conn:
+        return dict(
+            conn.execute(
+                text("SELECT tableoid::regclass::text, COUNT(*) FROM listings GROUP BY 1")
+            ).all()
+        )
+
+
+def data_version(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT version FROM data_version WHERE id = 1")).scalar_one()
+
+
+def test_load_year_partition_can_reload_same_year(pg_engine):
+    assert load_year_partition(pg_engine, 2018) == 2
+    assert load_year_partition(pg_engine, 2018) == 2
+
+    assert partition_counts(pg_engine) == {"listings_y2018": 2}
+    with pg_engine.connect() as conn:
+        names = conn.execute(
+            text("SELECT indexname FROM pg_indexes WHERE tablename = 'listings_y2018'")
+        ).scalars().all()
+    assert "listings_y2018_pkey" in names
+    assert "listings_y2018_vin_idx" in names
+    assert not any("_load_" in name for name in names)
+    with pg_engine.connect() as conn:
+        default_checks = conn.execute(
+            text(
+                "SELECT conname FROM pg_constraint "
+                "WHERE conrelid = 'listings_default'::regclass AND contype = 'c'"
+            )
+        ).scalars().all()
+    assert default_checks == []
+
+
+def test_load_year_partition_replaces_default_partition_rows(pg_engine):
+    with pg_engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO listings (year, vin, price, mileage) "
+                "VALUES (2018, '1HGCM82633A004352', 19000, 25000)"
+            )
+        )
+    assert partition_counts(pg_engine) == {"listings_default": 1}
+
+    load_year_partition(pg_engine, 2018)
+
+    assert partition_counts(pg_engine) == {"listings_y2018": 2}
+
+
+def test_load_year_partition_bumps_data_version(pg_engine):
+    before = data_version(pg_engine)
+
+    load_year_partition(pg_engine, 2018)
+
+    assert data_version(pg_engine) == before + 1
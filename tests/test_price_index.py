@@ -0,0 +1,118 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.db import SessionLocal
+from app.ingestion.price_index import build_price_index
+from app.models.listing import Listing
+from app.models.price_index import PriceIndexMonthly
+from app.models.vehicle import Vehicle
+from app.services.price_index_service import PriceIndexService
+
+
+def seed_listings(session):
+    # (price, mileage, first_seen, last_seen)
+    listings = [
+        (20000, 10000, date(2024, 1, 5), date(2024, 2, 20)),
+        (18000, 30000, date(2024, 1, 10), date(2024, 1, 28)),
+        (17000, 30000, date(2024, 2, 3), date(2024, 3, 15)),
+        (15000, 50000, date(2024, 3, 1), None),
+    ]
+    for idx, (price, mileage, first_seen, last_seen) in enumerate(listings):
+        vin = f"VIN{idx}"
+        session.add(Vehicle(vin=vin, year=2018, make="TOYOTA", model="CAMRY"))
+        session.add(
+            Listing(
+                vin=vin,
+                year=2018,
+                price=Decimal(price),
+                mileage=mileage,
+                first_seen_date=first_seen,
+                last_seen_date=last_seen,
+            )
+        )
+    session.commit()
+
+
+@pytest.fixture()
+def pg_session(pg_engine):
+    # The rollup is built with generate_series, so it needs Postgres.
+    with SessionLocal(bind=pg_engine) as session:
+        yield session
+
+
+def test_build_counts_listings_in_every_seen_month(pg_session):
+    session = pg_session
+    seed_listings(session)
+
+    written = build_price_index(session)
+    session.commit()
+    series = PriceIndexService(session).trend(2018, "TOYOTA", "CAMRY")
+
+    assert written == 3
+    assert [point.month for point in series] == [
+        date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)]
+    assert [point.listings for point in series] == [2, 2, 2]
+    assert series[0].average_price == 19000
+    # Jan and Feb both span 10k-30k miles, so their adjusted prices compare
+    # at the same reference mileage.
+    assert series[1].adjusted_price < series[0].adjusted_price
+
+
+def test_incremental_build_keeps_earlier_months(pg_session):
+    session = pg_session
+    seed_listings(session)
+    build_price_index(session)
+    session.commit()
+
+    session.add(Vehicle(vin="VIN9", year=2018, make="TOYOTA", model="CAMRY"))
+    session.add(
+        Listing(vin="VIN9", year=2018, price=Decimal(14000), mileage=60000,
+                first_seen_date=date(2024, 3, 20), last_seen_date=date(2024, 4, 2))
+    )
+    session.commit()
+    build_price_index(session, start_month=date(2024, 3, 1))
+    session.commit()
+
+    rows = {row.month: row.listings for row in session.query(PriceIndexMonthly)}
+    assert rows == {
+        date(2024, 1, 1): 2,
+        date(2024, 2, 1): 2,
+        date(2024, 3, 1): 3,
+        date(2024, 4, 1): 1,
+    }
+
+
+def add_month(session, month, sum_price, sum_mileage_price):
+    # Two listings at 10k and 30k miles.
+    session.add(
+        PriceIndexMonthly(
+            year=2018, make="TOYOTA", model="CAMRY", month=month, listings=2,
+            sum_mileage=40000.0, sum_price=sum_price, sum_mileage_sq=1e9,
+            sum_mileage_price=sum_mileage_price,
+        )
+    )
+
+
+def test_trend_adjusts_for_mileage(session):
+    add_month(session, date(2024, 1, 1), 38000.0, 7.4e8)
+    add_month(session, date(2024, 2, 1), 37000.0, 7.1e8)
+    session.commit()
+
+    series = PriceIndexService(session).trend(2018, "TOYOTA", "CAMRY")
+
+    assert series[0].average_price == 19000
+    assert series[1].adjusted_price < series[0].adjusted_price
+
+
+def test_trend_endpoint(client, session):
+    for month in (1, 2, 3):
+        add_month(session, date(2024, month, 1), 38000.0, 7.4e8)
+    session.commit()
+
+    resp = client.get("/api/trend?year=2018&make=toyota&model=camry")
+
+    assert resp.status_code == 200
+    assert [point["month"] for point in resp.json["points"]] == [
+        "2024-01", "2024-02", "2024-03"]
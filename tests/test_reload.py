@@ -0,0 +1,123 @@
+import pytest
+from sqlalchemy import text
+
+from app.db import SessionLocal
+from app.ingestion.reload import (
+    SHADOW_SCHEMA,
+    ReloadValidationError,
+    build_shadow,
+    reload_market_data,
+    validate_shadow,
+)
+from app.repositories.listing_repo import ListingRepository
+
+RAW_ROWS = [
+    # (vin, year, make, model, dealer, price, mileage)
+    ("4T1BF1FK5HU000001", 2017, "toyota", "camry", "Dealer A", 16000, 40000),
+    ("4T1BF1FK5JU000002", 2018, "TOYOTA", "Camry ", "Dealer A", 19000, 30000),
+    ("4T1BF1FK5JU000003", 2018, "Toyota", "CAMRY", "Dealer B", 18000, 35000),
+    ("4T1BF1FK5JU000003", 2018, "Toyota", "CAMRY", "Dealer B", 17500, 36000),
+]
+
+
+def seed_raw(engine, rows=RAW_ROWS):
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM market_listings_raw"))
+        conn.execute(
+            text(
+                "INSERT INTO market_listings_raw "
+                "(vin, year, make, model, dealer_name, dealer_city, dealer_state, "
+                "listing_price, listing_mileage) "
+                "VALUES (:vin, :year, :make, :model, :dealer, 'Austin', 'TX', "
+                ":price, :mileage)"
+            ),
+            [
+                dict(vin=vin, year=year, make=make, model=model, dealer=dealer,
+                     price=price, mileage=mileage)
+                for vin, year, make, model, dealer, price, mileage in rows
+            ],
+        )
+
+
+def live_counts(engine):
+    with engine.connect() as conn:
+        return {
+            table: conn.execute(text(f"SELECT COUNT(*) FROM public.{table}")).scalar_one()
+            for table in ("vehicles", "dealers", "listings")
+        }
+
+
+def data_version(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT version FROM data_version WHERE id = 1")).scalar_one()
+
+
+def test_reload_swaps_in_new_tables(pg_engine):
+    seed_raw(pg_engine)
+    before = data_version(pg_engine)
+
+    result = reload_market_data(pg_engine, index_workers=2)
+
+    assert (result.vehicles, result.dealers, result.listings) == (3, 2, 4)
+    assert result.data_version == data_version(pg_engine) == before + 1
+    assert live_counts(pg_engine) == {"vehicles": 3, "dealers": 2, "listings": 4}
+    with pg_engine.connect() as conn:
+        partitions = conn.execute(
+            text(
+                "SELECT c.relnamespace::regnamespace::text, c.relname "
+                "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'public.listings'::regclass"
+            )
+        ).all()
+        sequence = conn.execute(
+            text("SELECT pg_get_serial_sequence('public.listings', 'id')")
+        ).scalar_one()
+        schemas = conn.execute(
+            text("SELECT nspname FROM pg_namespace WHERE nspname LIKE 'carvalue_%'")
+        ).scalars().all()
+    assert sorted(partitions) == [
+        ("public", "listings_default"),
+        ("public", "listings_y2017"),
+        ("public", "listings_y2018"),
+    ]
+    assert sequence == "public.listings_id_seq"
+    assert schemas == []
+
+    with SessionLocal(bind=pg_engine) as session:
+        comparables = ListingRepository(session).get_comparables(
+            year=2018, make="TOYOTA", model="CAMRY"
+        )
+        assert len(comparables) == 3
+        # New rows still draw ids from the swapped-in sequence.
+        session.execute(
+            text(
+                "INSERT INTO listings (year, vin, price, mileage) "
+                "VALUES (2018, '4T1BF1FK5JU000002', 18500, 32000)"
+            )
+        )
+        session.commit()
+
+
+def test_reload_rejects_shrunken_load_and_keeps_live_tables(pg_engine):
+    seed_raw(pg_engine)
+    reload_market_data(pg_engine, index_workers=2)
+    version = data_version(pg_engine)
+
+    seed_raw(pg_engine, RAW_ROWS[:1])
+    with pytest.raises(ReloadValidationError):
+        reload_market_data(pg_engine, index_workers=2)
+
+    assert data_version(pg_engine) == version
+    assert live_counts(pg_engine) == {"vehicles": 3, "dealers": 2, "listings": 4}
+
+
+def test_validate_shadow_rejects_row_count_mismatch(pg_engine):
+    seed_raw(pg_engine)
+    build_shadow(pg_engine)
+    with pg_engine.begin() as conn:
+        conn.execute(
+            text(f"DELETE FROM {SHADOW_SCHEMA}.listings WHERE vin = '4T1BF1FK5HU000001'")
+        )
+
+    with pytest.raises(ReloadValidationError, match="listings"):
+        validate_shadow(pg_engine)
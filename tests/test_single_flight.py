@@ -0,0 +1,111 @@
+import time
+from decimal import Decimal
+from threading import Event, Thread
+
+import pytest
+
+from app.db import get_session
+from app.metrics import Metrics
+from app.models.listing import Listing
+from app.models.vehicle import Vehicle
+from app.services.single_flight import SingleFlight
+from app.services.valuation_service import ValuationService
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_concurrent_calls_share_one_execution():
+    metrics = Metrics()
+    flight = SingleFlight(metrics=metrics)
+    release = Event()
+    calls = []
+    results = []
+
+    def fit():
+        calls.append(1)
+        release.wait(5)
+        return "fit"
+
+    threads = [
+        Thread(target=lambda: results.append(flight.do(("CAMRY",), fit)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    wait_for(lambda: metrics.get("singleflight_coalesced") == 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["fit"] * 5
+    assert metrics.get("singleflight_executed") == 1
+
+
+def test_failed_call_releases_key():
+    flight = SingleFlight()
+
+    def fail():
+        raise RuntimeError("db down")
+
+    with pytest.raises(RuntimeError):
+        flight.do("key", fail)
+
+    assert flight.do("key", lambda: "ok") == "ok"
+
+
+def test_waiter_runs_its_own_call_after_timeout():
+    metrics = Metrics()
+    flight = SingleFlight(metrics=metrics, wait_timeout=0.05)
+    release = Event()
+    leader = Thread(target=lambda: flight.do("key", lambda: release.wait(5)))
+    leader.start()
+    wait_for(lambda: metrics.get("singleflight_executed") == 1)
+
+    result = flight.do("key", lambda: "own")
+    release.set()
+    leader.join()
+
+    assert result == "own"
+    assert metrics.get("singleflight_wait_timeouts") == 1
+
+
+def test_concurrent_estimates_share_one_fit(app, session, monkeypatch):
+    for idx, price in enumerate([15000, 16000, 17000]):
+        session.add(Vehicle(vin=f"VIN{idx}", year=2018, make="TOYOTA", model="CAMRY"))
+        session.add(Listing(vin=f"VIN{idx}", year=2018, price=Decimal(price),
+                            mileage=30000 + idx * 5000))
+    session.commit()
+    metrics = app.extensions["metrics"]
+    release = Event()
+    fit = ValuationService._fit
+
+    def slow_fit(self, **kwargs):
+        release.wait(5)
+        return fit(self, **kwargs)
+
+    monkeypatch.setattr(ValuationService, "_fit", slow_fit)
+    results = []
+
+    def estimate():
+        with get_session(app) as thread_session:
+            service = ValuationService.for_app(app, thread_session)
+            results.append(
+                service.estimate_value(year=2018, make="TOYOTA", model="CAMRY").estimate
+            )
+
+    threads = [Thread(target=estimate) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    wait_for(lambda: metrics.get("singleflight_coalesced") == 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert metrics.get("singleflight_executed") == 1
+    assert len(results) == 5 and len(set(results)) == 1
@@ -0,0 +1,34 @@
+import pytest
+
+from app.db import get_session
+from app.startup import measure_startup
+
+# What the application may add to cold start on top of importing Flask and
+# SQLAlchemy, as a fraction of that baseline. It adds a few percent today;
+# eagerly importing NumPy again would add about twenty.
+APP_START_BUDGET_RATIO = 0.1
+
+
+@pytest.fixture(scope="module")
+def report():
+    return measure_startup()
+
+
+def test_create_app_defers_heavy_imports(report):
+    assert "numpy" not in report.loaded_modules
+    assert "psycopg" not in report.loaded_modules
+    assert "app.services.valuation_service" not in report.loaded_modules
+    assert "app.models" not in report.loaded_modules
+
+
+def test_cold_start_within_budget(report):
+    assert report.app_ms < report.framework_ms * APP_START_BUDGET_RATIO
+
+
+def test_engine_created_on_first_session(app):
+    assert app.extensions["engine"] is None
+
+    with get_session(app):
+        pass
+
+    assert app.extensions["engine"] is not None
@@ -1,11 +1,15 @@
 from decimal import Decimal
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
+from app.models.data_version import DataVersion
 from app.models.dealer import Dealer
 from app.models.listing import Listing
 from app.models.vehicle import Vehicle
-from app.services.valuation_service import ValuationService
+from app.repositories.listing_repo import ListingRepository
+from app.services.fit_cache import FitCache
+from app.services.valuation_service import ComparableListing, ValuationService
 
 
 def seed_listings(session: Session):
@@ -33,6 +37,7 @@ def seed_listings(session: Session):
         session.add(
             Listing(
                 vin=vin,
+                year=2018,
                 dealer_id=dealer.id,
                 price=Decimal(price),
                 mileage=40000 + idx * 1000,
@@ -68,3 +73,87 @@ def test_mileage_adjustment_decreases_with_higher_mileage(session):
     assert base is not None
     assert higher is not None
     assert higher < base
+
+
+def test_fit_cache_invalidated_by_data_version(session):
+    seed_listings(session)
+    service = ValuationService(
+        session=session, fit_cache=FitCache(version_ttl=0))
+    before = service.estimate_value(
+        year=2018, make="TOYOTA", model="CAMRY").estimate
+
+    session.execute(update(Listing).values(price=Listing.price * 2))
+    session.commit()
+    cached = service.estimate_value(
+        year=2018, make="TOYOTA", model="CAMRY").estimate
+
+    session.add(DataVersion(id=1, version=2))
+    session.commit()
+    reloaded = service.estimate_value(
+        year=2018, make="TOYOTA", model="CAMRY").estimate
+
+    assert cached == before
+    assert reloaded == before * 2
+
+
+def test_sampled_fit_is_bounded_and_deterministic(session):
+    seed_listings(session)
+    repo = ListingRepository(session)
+
+    full = repo.get_comparables(year=2018, make="TOYOTA", model="CAMRY")
+    sample = repo.get_comparables(
+        year=2018, make="TOYOTA", model="CAMRY", sample_cap=4, bucket_miles=5000)
+    again = repo.get_comparables(
+        year=2018, make="TOYOTA", model="CAMRY", sample_cap=4, bucket_miles=5000)
+
+    # Mileages 40k-49k fall in two 5k buckets: 2 + 2 rows.
+    assert len(full) == 10
+    assert len(sample) == 4
+    assert {row[0].id for row in sample} == {row[0].id for row in again}
+    assert {row[0].mileage // 5000 for row in sample} == {8, 9}
+
+
+def test_sample_cap_above_group_size_matches_full_fit(session):
+    seed_listings(session)
+    full = ValuationService(session=session).estimate_value(
+        year=2018, make="TOYOTA", model="CAMRY", mileage=45000)
+    sampled = ValuationService(session=session, sample_cap=100).estimate_value(
+        year=2018, make="TOYOTA", model="CAMRY", mileage=45000)
+
+    assert sampled.estimate == full.estimate
+
+
+def test_comparables_share_label_strings(session):
+    seed_listings(session)
+    result = ValuationService(session=session).estimate_value(
+        year=2018, make="TOYOTA", model="CAMRY")
+
+    first, second = result.comparables[:2]
+    assert first.vehicle == "2018 TOYOTA CAMRY LE"
+    assert first.vehicle is second.vehicle
+    assert first.location is second.location
+
+
+def test_nearest_comparables_matches_full_sort():
+    comps = [
+        ComparableListing("car", Decimal(price), 0, "")
+        for price in range(10000, 30000, 150)
+    ]
+    for estimate in (Decimal(5000), Decimal(17520), Decimal(17575), Decimal(40000)):
+        expected = sorted(comps, key=lambda comp: abs(comp.price - estimate))[:100]
+        assert ValuationService._nearest_comparables(comps, estimate, 100) == expected
+
+
+def test_fit_cache_bounded_by_weight():
+    cache = FitCache(max_entries=10, max_weight=5, weigh=len)
+    cache.put("a", [1, 2])
+    cache.put("b", [1, 2])
+    cache.get("a")
+    cache.put("c", [1, 2])
+    cache.put("huge", [1] * 6)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1, 2]
+    assert cache.get("c") == [1, 2]
+    assert cache.get("huge") is None
+    assert cache.weight == 4
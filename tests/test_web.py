@@ -27,6 +27,7 @@ def seed_one_listing(session):
     session.add(
         Listing(
             vin="VIN123",
+            year=2018,
             dealer_id=dealer.id,
             price=Decimal("15000"),
             mileage=40000,
@@ -50,9 +51,25 @@ def test_estimate_page_returns_results(client, session):
         data={"year": "2018", "make": "Toyota", "model": "Camry"},
     )
     assert resp.status_code == 200
+    assert resp.is_streamed
     assert b"Estimated Market Value" in resp.data
 
 
+def test_estimate_page_flushes_estimate_before_table(client, session):
+    seed_one_listing(session)
+    resp = client.post(
+        "/estimate",
+        data={"year": "2018", "make": "Toyota", "model": "Camry"},
+        buffered=False,
+    )
+    chunks = list(resp.iter_encoded())
+    resp.close()
+    assert len(chunks) == 2
+    assert b"Estimated Market Value" in chunks[0]
+    assert b"<table>" in chunks[1]
+    assert b"flush" not in b"".join(chunks)
+
+
 def test_estimate_page_no_results(client):
     resp = client.post(
         "/estimate",
@@ -60,3 +77,50 @@ def test_estimate_page_no_results(client):
     )
     assert resp.status_code == 200
     assert b"No comparable listings" in resp.data
+
+
+def test_metrics_report_compiled_cache_hits(client, session):
+    seed_one_listing(session)
+    for year in ("2018", "2019", "2020"):
+        client.post(
+            "/estimate",
+            data={"year": year, "make": "Toyota", "model": "Camry"},
+        )
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.json["compiled_cache_hits"] >= 2
+    assert resp.json["compiled_cache_hit_rate"] > 0
+
+
+def test_estimate_by_vin_uses_squish_vin_siblings(client, session):
+    seed_one_listing(session)
+    session.add(
+        Vehicle(vin="4T1BF1FK5JU000001", year=2018, make="TOYOTA", model="CAMRY", trim="SE")
+    )
+    session.add(
+        Listing(vin="4T1BF1FK5JU000001", year=2018, price=Decimal("21000"), mileage=30000)
+    )
+    session.commit()
+
+    # Same WMI/VDS and model-year digit, different check digit and serial.
+    resp = client.post("/estimate", data={"vin": "4t1bf1fk9ju123456"})
+
+    assert resp.status_code == 200
+    assert b"2018 TOYOTA CAMRY SE" in resp.data
+    assert b"$21,000" in resp.data
+    assert b"Austin" not in resp.data
+
+
+def test_estimate_by_unknown_vin(client):
+    resp = client.post("/estimate", data={"vin": "1HGCM82633A004352"})
+
+    assert resp.status_code == 200
+    assert b"No comparable listings" in resp.data
+
+
+def test_estimate_rejects_malformed_vin(client):
+    resp = client.post("/estimate", data={"vin": "NOT-A-VIN"})
+
+    assert resp.status_code == 400
+    assert b"VIN must be 17" in resp.data